@@ -4,6 +4,7 @@ import plotly.express as px
 from datetime import datetime
 import time
 from config import BASE_DIR
+from artifacts import load_stats
 # Page config
 st.set_page_config(
     page_title="EstateAPR Gurgaon",
@@ -190,6 +191,16 @@ st.markdown("""
 
 st.markdown("<br>", unsafe_allow_html=True)
 
+# Artifact load times (shared by every session of this server process)
+with st.expander("⏱️ Artifact load times"):
+    stats = load_stats()
+    if stats:
+        stats_df = pd.DataFrame.from_dict(stats, orient="index")
+        stats_df["loaded_at"] = pd.to_datetime(stats_df["loaded_at"], unit="s")
+        st.dataframe(stats_df, use_container_width=True)
+    else:
+        st.caption("No artifacts loaded yet. Open a page to load its data.")
+
 # Footer
 st.markdown("---")
 col1, col2, col3 = st.columns(3)
@@ -0,0 +1,118 @@
+"""Budget-driven search: which sectors and BHKs fit under a given price.
+
+The model is evaluated once on a grid of sector x property type x BHK x
+built-up area, and prices along the area axis are made monotone with a
+running maximum.  A budget query is then a vectorized count over that grid,
+answering for every sector at once.  The grid's ~6% area steps are refined
+by bisecting the cell where the price crosses the budget with a few batched
+model calls (the model's price is piecewise constant in area, so
+interpolating between grid points could report an area over budget); every
+reported area is one the model prices at or under the budget.
+"""
+import numpy as np
+import pandas as pd
+
+from pricing import FEATURE_COLUMNS
+
+DEFAULT_AREAS = np.geomspace(300, 10000, 64).round()
+REFINE_STEPS = 6
+
+
+class AffordabilityGrid:
+    """Precomputed monotone price grid of shape (sector, type, BHK, area)."""
+
+    def __init__(self, sectors, property_types, bedrooms, areas, prices, predict=None, listing=None):
+        self.sectors = np.asarray(sectors)
+        self.property_types = np.asarray(property_types)
+        self.bedrooms = np.asarray(bedrooms)
+        self.areas = np.asarray(areas, dtype=float)
+        self.prices = np.maximum.accumulate(prices, axis=-1)
+        self.predict = predict
+        self.listing = listing
+
+    @classmethod
+    def build(cls, predict, listing, sectors, property_types, bedrooms, areas=DEFAULT_AREAS):
+        """Score the whole grid with one ``predict(frame)`` call.
+
+        The remaining features (balcony, age, furnishing, ...) are taken from
+        ``listing``; the bathroom count follows the BHK count.
+        """
+        areas = np.sort(np.asarray(areas, dtype=float))
+        grid = pd.MultiIndex.from_product(
+            [list(sectors), list(property_types), list(bedrooms), areas],
+            names=["sector", "property_type", "bedRoom", "built_up_area"],
+        ).to_frame(index=False)
+
+        batch = grid.copy()
+        batch["bathroom"] = batch["bedRoom"]
+        for column in FEATURE_COLUMNS:
+            if column not in batch:
+                batch[column] = listing[column]
+        batch = batch[FEATURE_COLUMNS]
+
+        shape = (len(sectors), len(property_types), len(bedrooms), len(areas))
+        prices = np.asarray(predict(batch), dtype=float).reshape(shape)
+        return cls(sectors, property_types, bedrooms, areas, prices, predict, dict(listing))
+
+    def _batch(self, sector_idx, type_idx, bhk_idx, areas):
+        batch = pd.DataFrame({
+            "sector": self.sectors[sector_idx],
+            "property_type": self.property_types[type_idx],
+            "bedRoom": self.bedrooms[bhk_idx],
+            "built_up_area": areas,
+        })
+        batch["bathroom"] = batch["bedRoom"]
+        for column in FEATURE_COLUMNS:
+            if column not in batch:
+                batch[column] = self.listing[column]
+        return batch[FEATURE_COLUMNS]
+
+    def query(self, budget, property_types=None, bedrooms=None, refine_steps=REFINE_STEPS):
+        """Largest affordable built-up area per sector, type and BHK.
+
+        Returns one row per combination with at least one grid area priced at
+        or under ``budget`` (in Cr), with the largest affordable ``max_area``
+        and its monotone model ``price``, sorted by descending area.  The area
+        is refined by ``refine_steps`` rounds of bisection inside the grid cell
+        where the budget is crossed, scoring all combinations in one
+        ``predict`` call per round; without a model it is the grid area.
+        """
+        counts = (self.prices <= budget).sum(axis=-1)
+        sector_idx, type_idx, bhk_idx = np.nonzero(counts)
+        keep = np.ones(len(sector_idx), dtype=bool)
+        if property_types is not None:
+            keep &= np.isin(self.property_types[type_idx], list(property_types))
+        if bedrooms is not None:
+            keep &= np.isin(self.bedrooms[bhk_idx], list(bedrooms))
+        sector_idx, type_idx, bhk_idx = sector_idx[keep], type_idx[keep], bhk_idx[keep]
+        area_idx = counts[sector_idx, type_idx, bhk_idx] - 1
+
+        max_area = self.areas[area_idx]
+        price = self.prices[sector_idx, type_idx, bhk_idx, area_idx]
+
+        # Bisect [area, next grid area] where the next grid area busts the budget
+        crossing = np.flatnonzero(area_idx < len(self.areas) - 1)
+        if self.predict is not None and len(crossing) and refine_steps:
+            low = max_area[crossing].copy()
+            low_price = price[crossing].copy()
+            high = self.areas[area_idx[crossing] + 1]
+            for _ in range(refine_steps):
+                middle = (low + high) / 2
+                batch = self._batch(sector_idx[crossing], type_idx[crossing], bhk_idx[crossing], middle)
+                # Same running maximum as the grid: never cheaper than a smaller area
+                middle_price = np.maximum(np.asarray(self.predict(batch), dtype=float), low_price)
+                fits = middle_price <= budget
+                low = np.where(fits, middle, low)
+                low_price = np.where(fits, middle_price, low_price)
+                high = np.where(fits, high, middle)
+            max_area[crossing] = low
+            price[crossing] = low_price
+
+        result = pd.DataFrame({
+            "sector": self.sectors[sector_idx],
+            "property_type": self.property_types[type_idx],
+            "bedRoom": self.bedrooms[bhk_idx],
+            "max_area": max_area,
+            "price": price,
+        })
+        return result.sort_values(["max_area", "price"], ascending=[False, True]).reset_index(drop=True)
@@ -0,0 +1,444 @@
+"""Dashboard dataset preparation.
+
+``build_artifacts.py analytics`` turns the analysis CSV into a typed,
+uncompressed Feather file with the sector coordinates already joined,
+categorical labels and downcast numerics.  Reading it memory-maps the file
+instead of parsing text.  The same command writes :class:`AnalyticsCube`, the
+aggregates the dashboard answers its KPIs and group-bys from;
+:class:`BitmapIndex` filters the rows its scatter and box plots draw.
+"""
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_COLUMNS = [
+    "property_type", "society", "sector", "balcony", "agePossession", "luxury_category", "floor_category",
+]
+# Kept as float64: the price filters compare them against 2-decimal bucket edges,
+# and e.g. 3.3 in float32 is 3.2999999523, one bucket lower
+EXACT_COLUMNS = ["price", "price_per_sqft"]
+
+
+def prepare_analytics_frame(df, sector_coordinates):
+    """Listings with sector ``lat``/``lng`` joined, compact dtypes except for
+    the :data:`EXACT_COLUMNS`.
+
+    Rows whose sector has no known coordinates are dropped.
+    """
+    df = df.copy()
+    df["lat"] = df["sector"].map({sector: point.get("lat") for sector, point in sector_coordinates.items()})
+    df["lng"] = df["sector"].map({sector: point.get("lng") for sector, point in sector_coordinates.items()})
+    df = df[df["lat"].notna() & df["lng"].notna()].reset_index(drop=True)
+
+    for column in df.columns:
+        if column in CATEGORICAL_COLUMNS:
+            df[column] = df[column].astype(str).astype("category")
+        elif pd.api.types.is_integer_dtype(df[column]):
+            df[column] = pd.to_numeric(df[column], downcast="integer")
+        elif pd.api.types.is_float_dtype(df[column]) and column not in EXACT_COLUMNS:
+            df[column] = df[column].astype(np.float32)
+    return df
+
+
+def write_analytics(frame, path):
+    """Uncompressed Feather so readers can memory-map it."""
+    frame.to_feather(path, compression="uncompressed")
+
+
+def read_analytics(path):
+    from pyarrow import feather
+
+    frame = feather.read_table(path, memory_map=True).to_pandas()
+    stale = [column for column in EXACT_COLUMNS if frame[column].dtype != np.float64]
+    if stale:
+        raise ValueError(f"{path} stores {', '.join(stale)} below float64; rebuild it")
+    return frame
+
+
+AMENITY_COLUMNS = ["study room", "servant room", "store room", "pooja room"]
+CORRELATION_COLUMNS = ["price", "price_per_sqft", "bedRoom", "bathroom", "built_up_area", "amenity_score"]
+PRICE_BUCKETS = 48
+PPSF_BINS = 40
+CUBE_FORMAT_VERSION = 1
+
+
+def amenity_score(frame):
+    return frame[AMENITY_COLUMNS].sum(axis=1)
+
+
+def price_edges(prices, buckets=PRICE_BUCKETS):
+    """Log-spaced price bucket edges in Cr, rounded to 2 decimals."""
+    low = np.floor(np.min(prices) * 100) / 100
+    high = np.ceil(np.max(prices) * 100) / 100
+    edges = np.unique(np.round(np.geomspace(max(low, 0.01), max(high, 0.02), buckets + 1), 2))
+    edges[0], edges[-1] = low, high
+    return edges
+
+
+def bucket_of(values, edges):
+    """Bucket index of each value; bucket ``i`` is ``[edges[i], edges[i + 1])``,
+    the last one closed.
+
+    Edges are compared in the dtype of ``values``, as a pandas filter such as
+    ``df.price >= edge`` would, so a value stored exactly at an edge lands in
+    the bucket that edge opens.
+    """
+    values = np.asarray(values)
+    dtype = values.dtype if np.issubdtype(values.dtype, np.floating) else np.float64
+    edges = np.asarray(edges).astype(dtype)
+    return np.clip(np.searchsorted(edges, values, side="right") - 1, 0, len(edges) - 2)
+
+
+def merge_bins(edges, counts, bins):
+    """Merge adjacent histogram bins so that at most ``bins`` remain."""
+    step = -(-len(counts) // bins)
+    starts = np.arange(0, len(counts), step)
+    return np.append(edges[starts], edges[-1]), np.add.reduceat(counts, starts)
+
+
+def _labels(values):
+    return [str(value) for value in pd.unique(pd.Series(values).astype(str))]
+
+
+def _codes(values, labels):
+    return pd.Categorical(pd.Series(values).astype(str), categories=labels).codes.astype(np.int32)
+
+
+class AnalyticsCube:
+    """Listings pre-aggregated over luxury x bedRoom x sector x price bucket.
+
+    Only non-empty cells are stored.  Each cell keeps its row count, price
+    and price/sqft sums and extremes, per-floor-category and
+    per-agePossession counts and sums, a price/sqft histogram and the first
+    and second moments of :data:`CORRELATION_COLUMNS`.  All of them merge by
+    addition (or max/min), so any combination of the dashboard filters is
+    answered by reducing the selected cells, at a cost that depends on the
+    number of cells rather than listings.  Medians come from the price
+    buckets and are exact to within one bucket.
+    """
+
+    _ARRAYS = (
+        "luxury_code", "bedroom_code", "sector_code", "bucket", "count", "price_sum", "ppsf_sum",
+        "ppsf_max", "ppsf_min", "floor_count", "floor_price_sum", "age_count", "age_price_sum",
+        "age_ppsf_sum", "ppsf_hist", "moment_sums", "moment_products",
+    )
+    _LABELS = ("luxury_labels", "sectors", "floor_labels", "age_labels")
+    _VALUES = ("bedrooms", "price_edges", "ppsf_edges", "sector_lat", "sector_lng")
+
+    def __init__(self, **parts):
+        for name in self._ARRAYS + self._VALUES:
+            setattr(self, name, np.asarray(parts[name]))
+        for name in self._LABELS:
+            setattr(self, name, [str(label) for label in parts[name]])
+
+    @classmethod
+    def build(cls, frame, price_buckets=PRICE_BUCKETS, ppsf_bins=PPSF_BINS):
+        """Aggregate the dashboard ``frame`` (see :func:`prepare_analytics_frame`)."""
+        # Bucketed in their stored dtype; see bucket_of
+        prices = frame["price"].to_numpy()
+        ppsf = frame["price_per_sqft"].to_numpy()
+
+        luxury_labels = _labels(frame["luxury_category"])
+        bedrooms = np.sort(frame["bedRoom"].unique())
+        sectors = sorted(_labels(frame["sector"]))
+        floor_labels = sorted(_labels(frame["floor_category"]))
+        age_labels = sorted(_labels(frame["agePossession"]))
+        edges = price_edges(prices, price_buckets)
+        ppsf_edges = np.geomspace(max(ppsf.min(), 1.0), ppsf.max() * (1 + 1e-9), ppsf_bins + 1)
+
+        dims = (
+            _codes(frame["luxury_category"], luxury_labels),
+            np.searchsorted(bedrooms, frame["bedRoom"].to_numpy()).astype(np.int32),
+            _codes(frame["sector"], sectors),
+            bucket_of(prices, edges).astype(np.int32),
+        )
+        shape = (len(luxury_labels), len(bedrooms), len(sectors), len(edges) - 1)
+        cells, cell_of_row = np.unique(np.ravel_multi_index(dims, shape), return_inverse=True)
+        n = len(cells)
+
+        def per_cell(weights=None):
+            return np.bincount(cell_of_row, weights=weights, minlength=n)
+
+        def per_cell_and(codes, width, weights=None):
+            return np.bincount(cell_of_row * width + codes, weights=weights, minlength=n * width).reshape(n, width)
+
+        ppsf_max = np.full(n, -np.inf)
+        ppsf_min = np.full(n, np.inf)
+        np.maximum.at(ppsf_max, cell_of_row, ppsf)
+        np.minimum.at(ppsf_min, cell_of_row, ppsf)
+
+        floor_codes = _codes(frame["floor_category"], floor_labels)
+        age_codes = _codes(frame["agePossession"], age_labels)
+        ppsf_codes = bucket_of(ppsf, ppsf_edges)
+
+        moments = frame.assign(amenity_score=amenity_score(frame))[CORRELATION_COLUMNS].to_numpy(dtype=float)
+        k = moments.shape[1]
+        products = (moments[:, :, None] * moments[:, None, :]).reshape(len(frame), k * k)
+        moment_sums = np.column_stack([per_cell(moments[:, j]) for j in range(k)])
+        moment_products = np.column_stack([per_cell(products[:, j]) for j in range(k * k)]).reshape(n, k, k)
+
+        sector_lat = frame.groupby(dims[2])["lat"].first().reindex(range(len(sectors))).to_numpy(dtype=float)
+        sector_lng = frame.groupby(dims[2])["lng"].first().reindex(range(len(sectors))).to_numpy(dtype=float)
+
+        luxury_code, bedroom_code, sector_code, bucket = np.unravel_index(cells, shape)
+        return cls(
+            luxury_code=luxury_code.astype(np.int16),
+            bedroom_code=bedroom_code.astype(np.int16),
+            sector_code=sector_code.astype(np.int32),
+            bucket=bucket.astype(np.int16),
+            count=per_cell().astype(np.int64),
+            price_sum=per_cell(prices),
+            ppsf_sum=per_cell(ppsf),
+            ppsf_max=ppsf_max,
+            ppsf_min=ppsf_min,
+            floor_count=per_cell_and(floor_codes, len(floor_labels)).astype(np.int64),
+            floor_price_sum=per_cell_and(floor_codes, len(floor_labels), prices),
+            age_count=per_cell_and(age_codes, len(age_labels)).astype(np.int64),
+            age_price_sum=per_cell_and(age_codes, len(age_labels), prices),
+            age_ppsf_sum=per_cell_and(age_codes, len(age_labels), ppsf),
+            ppsf_hist=per_cell_and(ppsf_codes, ppsf_bins).astype(np.int64),
+            moment_sums=moment_sums,
+            moment_products=moment_products,
+            luxury_labels=luxury_labels,
+            sectors=sectors,
+            floor_labels=floor_labels,
+            age_labels=age_labels,
+            bedrooms=bedrooms,
+            price_edges=edges,
+            ppsf_edges=ppsf_edges,
+            sector_lat=sector_lat,
+            sector_lng=sector_lng,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) != CUBE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported analytics cube version in {path}")
+            parts = {name: data[name] for name in cls._ARRAYS + cls._VALUES}
+            parts.update({name: data[name].tolist() for name in cls._LABELS})
+        return cls(**parts)
+
+    def save(self, path):
+        parts = {name: getattr(self, name) for name in self._ARRAYS + self._VALUES}
+        parts.update({name: np.asarray(getattr(self, name), dtype=str) for name in self._LABELS})
+        with open(path, "wb") as file:
+            np.savez(file, format_version=np.int32(CUBE_FORMAT_VERSION), **parts)
+
+    def __len__(self):
+        return len(self.count)
+
+    def select(self, luxury=None, bedroom=None, sectors=None, buckets=None):
+        """Boolean mask over cells; ``None`` leaves a dimension unfiltered.
+
+        ``buckets`` is a ``(first, stop)`` range of price bucket indices.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if luxury is not None:
+            mask &= self.luxury_code == self.luxury_labels.index(str(luxury))
+        if bedroom is not None:
+            mask &= self.bedroom_code == int(np.searchsorted(self.bedrooms, bedroom))
+        if sectors is not None:
+            mask &= np.isin(self.sector_code, [self.sectors.index(str(sector)) for sector in sectors])
+        if buckets is not None:
+            mask &= (self.bucket >= buckets[0]) & (self.bucket < buckets[1])
+        return mask
+
+    def total(self, mask):
+        return int(self.count[mask].sum())
+
+    def _by(self, codes, size, mask, values):
+        return np.bincount(codes[mask], weights=values[mask], minlength=size)
+
+    def by_sector(self, mask):
+        """Per-sector ``count``, mean ``price`` and ``price_per_sqft``, price/sqft
+        extremes and coordinates, for sectors with listings."""
+        size = len(self.sectors)
+        count = self._by(self.sector_code, size, mask, self.count)
+        ppsf_max = np.full(size, -np.inf)
+        ppsf_min = np.full(size, np.inf)
+        np.maximum.at(ppsf_max, self.sector_code[mask], self.ppsf_max[mask])
+        np.minimum.at(ppsf_min, self.sector_code[mask], self.ppsf_min[mask])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frame = pd.DataFrame({
+                "sector": self.sectors,
+                "count": count.astype(np.int64),
+                "price": self._by(self.sector_code, size, mask, self.price_sum) / count,
+                "price_per_sqft": self._by(self.sector_code, size, mask, self.ppsf_sum) / count,
+                "ppsf_max": ppsf_max,
+                "ppsf_min": ppsf_min,
+                "lat": self.sector_lat,
+                "lng": self.sector_lng,
+            })
+        return frame[frame["count"] > 0].reset_index(drop=True)
+
+    def by_bedroom(self, mask):
+        """Listing count per bedroom count, sorted by bedrooms, non-zero only."""
+        counts = pd.Series(self._by(self.bedroom_code, len(self.bedrooms), mask, self.count).astype(np.int64), index=self.bedrooms)
+        return counts[counts > 0]
+
+    def by_luxury(self, mask):
+        """Listing count and mean price per luxury category, non-empty only."""
+        size = len(self.luxury_labels)
+        count = self._by(self.luxury_code, size, mask, self.count)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frame = pd.DataFrame(
+                {"count": count.astype(np.int64), "price": self._by(self.luxury_code, size, mask, self.price_sum) / count},
+                index=self.luxury_labels,
+            )
+        return frame[frame["count"] > 0]
+
+    def by_floor(self, mask):
+        """Mean price per floor category, non-empty only."""
+        count = self.floor_count[mask].sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            price = pd.Series(self.floor_price_sum[mask].sum(axis=0) / count, index=self.floor_labels)
+        return price[count > 0]
+
+    def by_age(self, mask):
+        """Mean ``price`` and ``price_per_sqft`` per agePossession, non-empty only."""
+        count = self.age_count[mask].sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frame = pd.DataFrame({
+                "agePossession": self.age_labels,
+                "price": self.age_price_sum[mask].sum(axis=0) / count,
+                "price_per_sqft": self.age_ppsf_sum[mask].sum(axis=0) / count,
+            })
+        return frame[count > 0].reset_index(drop=True)
+
+    def price_histogram(self, mask):
+        """``(edges, counts)`` over the price buckets."""
+        return self.price_edges, self._by(self.bucket, len(self.price_edges) - 1, mask, self.count)
+
+    def ppsf_histogram(self, mask):
+        """``(edges, counts)`` over the price/sqft sketch bins."""
+        return self.ppsf_edges, self.ppsf_hist[mask].sum(axis=0)
+
+    def price_quantile(self, mask, q=0.5):
+        """Price quantile, interpolated within its bucket; NaN if empty."""
+        edges, counts = self.price_histogram(mask)
+        total = counts.sum()
+        if total == 0:
+            return float("nan")
+        cumulative = np.cumsum(counts)
+        i = int(np.searchsorted(cumulative, q * total))
+        before = cumulative[i - 1] if i > 0 else 0
+        fraction = (q * total - before) / counts[i] if counts[i] else 0.0
+        return float(edges[i] + fraction * (edges[i + 1] - edges[i]))
+
+    def mean(self, mask, column):
+        """Exact mean of ``price`` or ``price_per_sqft``."""
+        sums = self.price_sum if column == "price" else self.ppsf_sum
+        total = self.count[mask].sum()
+        return float(sums[mask].sum() / total) if total else float("nan")
+
+    def correlation(self, mask):
+        """Pearson correlation of :data:`CORRELATION_COLUMNS` from the cell moments."""
+        n = self.count[mask].sum()
+        sums = self.moment_sums[mask].sum(axis=0)
+        products = self.moment_products[mask].sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            covariance = products / n - np.outer(sums, sums) / n ** 2
+            std = np.sqrt(np.diag(covariance))
+            correlation = covariance / np.outer(std, std)
+        return pd.DataFrame(correlation, index=CORRELATION_COLUMNS, columns=CORRELATION_COLUMNS)
+
+
+class BitmapIndex:
+    """Packed bitmaps per categorical value and a sorted price index.
+
+    Filters resolve to one packed row-selection vector by bitwise AND (and
+    OR across the chosen sectors), without copying the frame.  Price ranges
+    whose bounds are ``price_edges`` are the XOR of two packed prefix
+    bitmaps precomputed at those edges; a price range alone is a slice of
+    the sorted index.  Only the non-zero bytes of the selection are unpacked,
+    and :meth:`take` materializes only the requested columns of the selected
+    rows.
+    """
+
+    COLUMNS = ("luxury_category", "bedRoom", "sector")
+
+    def __init__(self, frame, price_edges=()):
+        self.frame = frame
+        self.n = len(frame)
+        self.bitmaps = {}
+        for column in self.COLUMNS:
+            values = frame[column].to_numpy()
+            codes, uniques = pd.factorize(values, sort=True)
+            self.bitmaps[column] = {
+                value: np.packbits(codes == code) for code, value in enumerate(uniques.tolist())
+            }
+        self.prices = frame["price"].to_numpy()
+        self.price_order = np.argsort(self.prices, kind="stable").astype(np.int32)
+        self.sorted_prices = self.prices[self.price_order]
+        # Bounds are compared in the stored dtype, like bucket_of and ``df.price >= low``
+        self._price_dtype = self.prices.dtype if np.issubdtype(self.prices.dtype, np.floating) else np.float64
+        self._none = np.zeros((self.n + 7) // 8, dtype=np.uint8)
+
+        # Packed bitmap of the first k rows in price order, for every cut at an edge
+        edges = np.asarray(price_edges, dtype=float).astype(self._price_dtype)
+        cuts = np.union1d(
+            np.searchsorted(self.sorted_prices, edges, side="left"),
+            np.searchsorted(self.sorted_prices, edges, side="right"),
+        )
+        self._prefixes = {}
+        below = np.zeros(self.n, dtype=bool)
+        previous = 0
+        for cut in np.union1d(cuts, [0]).tolist():
+            below[self.price_order[previous:cut]] = True
+            self._prefixes[cut] = np.packbits(below)
+            previous = cut
+
+    def _value(self, column, value):
+        return self.bitmaps[column].get(value, self._none)
+
+    def _price_slice(self, low, high, include_high=True):
+        """``(start, stop)`` in price order of ``low <= price < high``
+        (``<= high`` if ``include_high``)."""
+        low, high = np.asarray([low, high], dtype=float).astype(self._price_dtype)
+        start = int(np.searchsorted(self.sorted_prices, low, side="left"))
+        stop = int(np.searchsorted(self.sorted_prices, high, side="right" if include_high else "left"))
+        return start, max(start, stop)
+
+    def _rows(self, selection):
+        """Positions of the set bits of ``selection``, unpacking only non-zero bytes."""
+        nonzero = np.flatnonzero(selection)
+        byte, bit = np.nonzero(np.unpackbits(selection[nonzero]).reshape(-1, 8))
+        return nonzero[byte] * 8 + bit
+
+    def select(self, luxury=None, bedroom=None, sectors=None, price=None):
+        """Positions of the rows passing the filters, ascending; ``None``
+        leaves a filter off.
+
+        ``price`` is ``(low, high, include_high)``: ``low <= price < high``,
+        or ``<= high`` if ``include_high``.
+        """
+        bitmaps = []
+        if luxury is not None:
+            bitmaps.append(self._value("luxury_category", luxury))
+        if bedroom is not None:
+            bitmaps.append(self._value("bedRoom", bedroom))
+        if sectors is not None:
+            bitmaps.append(np.bitwise_or.reduce([self._value("sector", sector) for sector in sectors] + [self._none]))
+
+        low = high = None
+        if price is not None:
+            start, stop = self._price_slice(*price)
+            if not bitmaps:
+                return np.sort(self.price_order[start:stop])
+            if start in self._prefixes and stop in self._prefixes:
+                bitmaps.append(self._prefixes[stop] ^ self._prefixes[start])
+            else:
+                low, high = self.sorted_prices[start:stop][[0, -1]] if stop > start else (np.inf, -np.inf)
+        if not bitmaps:
+            return np.arange(self.n)
+
+        rows = self._rows(np.bitwise_and.reduce(bitmaps))
+        if low is not None:
+            # Bounds between edges: check the prices of the rows selected so far
+            prices = self.prices[rows]
+            rows = rows[(prices >= low) & (prices <= high)]
+        return rows
+
+    def take(self, rows, columns):
+        """Only ``columns`` of ``rows``, as a new frame."""
+        return pd.DataFrame({column: self.frame[column].to_numpy()[rows] for column in columns})
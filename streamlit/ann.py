@@ -0,0 +1,211 @@
+"""Nearest-neighbour recommendation without dense N x N similarity matrices.
+
+Each property keeps one feature vector per similarity source (facilities
+TF-IDF, price-detail features, location proximity), each normalized to unit
+length and concatenated.  The blended similarity of two properties,
+``sum(w_b * cos_b)``, is then the dot product of the stored vector with the
+query vector whose blocks are scaled by the weights, so any weighting is
+answered by one index.
+
+Search is an exact blocked brute-force scan by default, which stays fast
+at the catalog sizes this app serves.  Random-hyperplane LSH (candidates
+reranked exactly) is only used when ``exact_threshold`` opts into it, and
+only if a sample of queries measured at build time reaches
+:data:`RECALL_TARGET`; the table count is doubled until it does, otherwise
+the exact scan is kept.  :func:`recall_at_k` measures the approximation
+against the exact result.
+"""
+import numpy as np
+import pandas as pd
+
+from recommender import DEFAULT_WEIGHTS, top_k
+
+EXACT_THRESHOLD = None
+RECALL_TARGET = 0.9
+MAX_TABLES = 64
+CALIBRATION_QUERIES = 200
+
+
+def normalize_rows(matrix):
+    """Rows scaled to unit length; all-zero rows stay zero."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1)
+
+
+class ExactIndex:
+    """Brute-force inner-product search, scanning the catalog in blocks."""
+
+    def __init__(self, vectors, block_size=8192):
+        self.vectors = vectors
+        self.block_size = block_size
+
+    def add(self, vectors):
+        self.vectors = vectors
+
+    def search(self, query, k, exclude=None):
+        """IDs and scores of the ``k`` best matches of ``query``."""
+        n = len(self.vectors)
+        best_ids = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, n, self.block_size):
+            scores = self.vectors[start:start + self.block_size] @ query
+            local_exclude = exclude - start if exclude is not None and start <= exclude < start + len(scores) else None
+            ids = top_k(scores, k, exclude=local_exclude)
+            best_ids = np.concatenate([best_ids, ids + start])
+            best_scores = np.concatenate([best_scores, scores[ids]])
+        keep = top_k(best_scores, k)
+        return best_ids[keep], best_scores[keep]
+
+
+class LSHIndex:
+    """Random-hyperplane LSH over unit vectors with exact reranking.
+
+    Every table hashes a vector to the sign pattern of ``n_bits`` random
+    projections.  A query probes its own bucket and the buckets one bit away
+    in every table, then scores the union of candidates exactly.
+    """
+
+    def __init__(self, vectors, n_tables=8, n_bits=None, bucket_size=32, seed=42):
+        self.vectors = vectors
+        n, dim = vectors.shape
+        if n_bits is None:
+            n_bits = int(np.clip(np.ceil(np.log2(max(n, 1) / bucket_size)), 4, 24))
+        self.n_bits = n_bits
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((n_tables, dim, n_bits)).astype(np.float32)
+        self._weights = (1 << np.arange(n_bits)).astype(np.int64)
+
+        self.tables = []
+        for planes in self.planes:
+            codes = self._codes(vectors, planes)
+            order = np.argsort(codes, kind="stable")
+            sorted_codes = codes[order]
+            self.tables.append((sorted_codes, order))
+
+    def add(self, vectors):
+        """Hash newly appended rows of ``vectors`` into every table."""
+        start = len(self.tables[0][1])
+        self.vectors = vectors
+        new_ids = np.arange(start, len(vectors))
+        for t, planes in enumerate(self.planes):
+            sorted_codes, order = self.tables[t]
+            codes = self._codes(vectors[start:], planes)
+            positions = np.searchsorted(sorted_codes, codes, side="right")
+            self.tables[t] = (np.insert(sorted_codes, positions, codes), np.insert(order, positions, new_ids))
+
+    def _codes(self, vectors, planes):
+        return ((vectors @ planes) > 0).astype(np.int64) @ self._weights
+
+    def candidates(self, query):
+        """IDs sharing a bucket (or a bucket one bit away) with ``query``."""
+        found = []
+        flips = np.concatenate([[0], 1 << np.arange(self.n_bits)])
+        for planes, (sorted_codes, order) in zip(self.planes, self.tables):
+            probes = self._codes(query[None, :], planes)[0] ^ flips
+            starts = np.searchsorted(sorted_codes, probes, side="left")
+            stops = np.searchsorted(sorted_codes, probes, side="right")
+            found.extend(order[start:stop] for start, stop in zip(starts, stops) if stop > start)
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def search(self, query, k, exclude=None):
+        """Approximate IDs and scores of the ``k`` best matches of ``query``."""
+        ids = self.candidates(query)
+        if exclude is not None:
+            ids = ids[ids != exclude]
+        if len(ids) < k:
+            return ExactIndex(self.vectors).search(query, k, exclude)
+        scores = self.vectors[ids] @ query
+        keep = top_k(scores, k)
+        return ids[keep], scores[keep]
+
+
+class AnnRecommender:
+    """Top-k similar properties from per-property feature blocks.
+
+    Catalogs larger than ``exact_threshold`` (never, if ``None``) try LSH;
+    ``recall`` is the recall@5 measured for it at build time, 1.0 for the
+    exact scan.
+    """
+
+    def __init__(self, names, blocks, exact_threshold=EXACT_THRESHOLD, recall_target=RECALL_TARGET, **lsh_options):
+        self.names = np.asarray(names)
+        normalized = [normalize_rows(block) for block in blocks]
+        self.slices = []
+        start = 0
+        for block in normalized:
+            self.slices.append(slice(start, start + block.shape[1]))
+            start += block.shape[1]
+        self.vectors = np.ascontiguousarray(np.hstack(normalized))
+        self._ids_by_name = {name: i for i, name in enumerate(self.names.tolist())}
+        self.index = ExactIndex(self.vectors)
+        self.recall = 1.0
+        if exact_threshold is not None and len(self.names) > exact_threshold:
+            self._calibrate_lsh(recall_target, **lsh_options)
+
+    def _calibrate_lsh(self, target, n_tables=8, seed=42, **options):
+        """Switch to the cheapest LSH index whose sampled recall@5 reaches ``target``."""
+        exact = self.index
+        rng = np.random.default_rng(seed)
+        queries = rng.choice(len(self.names), min(CALIBRATION_QUERIES, len(self.names)), replace=False)
+
+        def truth(i, k):
+            return exact.search(self.query_vector(i), k, exclude=i)
+
+        while n_tables <= MAX_TABLES:
+            index = LSHIndex(self.vectors, n_tables=n_tables, seed=seed, **options)
+            recall = recall_at_k(lambda i, k: index.search(self.query_vector(i), k, exclude=i), truth, queries)
+            if recall >= target:
+                self.index, self.recall = index, recall
+                return
+            n_tables *= 2
+
+    def __contains__(self, name):
+        return name in self._ids_by_name
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, names, blocks):
+        """Append properties and index them; returns their new IDs."""
+        start = len(self.names)
+        normalized = np.hstack([normalize_rows(block) for block in blocks])
+        self.names = np.concatenate([self.names, np.asarray(names)])
+        self.vectors = np.ascontiguousarray(np.vstack([self.vectors, normalized]))
+        for i, name in enumerate(np.asarray(names).tolist(), start):
+            self._ids_by_name[name] = i
+        self.index.add(self.vectors)
+        return np.arange(start, len(self.names))
+
+    def id_of(self, name):
+        return self._ids_by_name[name]
+
+    def query_vector(self, property_id, weights=DEFAULT_WEIGHTS):
+        """Stored vector of ``property_id`` with each block scaled by its weight."""
+        query = self.vectors[property_id].copy()
+        for block, weight in zip(self.slices, weights):
+            query[block] *= weight
+        return query
+
+    def search(self, property_id, k=5, weights=DEFAULT_WEIGHTS):
+        return self.index.search(self.query_vector(property_id, weights), k, exclude=property_id)
+
+    def recommend(self, name, k=5, weights=DEFAULT_WEIGHTS):
+        """Same frame as :func:`recommender.recommend`."""
+        ids, scores = self.search(self.id_of(name), k, weights)
+        return pd.DataFrame({"PropertyName": self.names[ids], "SimilarityScore": scores})
+
+
+def recall_at_k(approximate, exact, queries, k=5):
+    """Mean fraction of the exact top ``k`` found by ``approximate``.
+
+    ``approximate`` and ``exact`` are ``search(property_id, k)`` callables.
+    """
+    recalls = []
+    for property_id in queries:
+        truth = exact(property_id, k)[0]
+        found = approximate(property_id, k)[0]
+        recalls.append(len(np.intersect1d(truth, found)) / max(len(truth), 1))
+    return float(np.mean(recalls))
@@ -0,0 +1,434 @@
+"""Process-wide loaders for the models and datasets used by the pages.
+
+Streamlit re-executes a page script on every widget interaction, so anything
+loaded in the script body is loaded again on every click.  The loaders below
+keep a single copy of each artifact per server process, shared by every
+session, and only reload it when the file on disk changes.
+
+Arrays handed out from here are marked read-only.  Pages must ``.copy()`` a
+DataFrame before adding or overwriting columns on it.
+"""
+import hashlib
+import json
+import pickle
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import BASE_DIR
+
+MODELS_DIR = BASE_DIR / "models"
+DATASETS_DIR = BASE_DIR / "datasets"
+
+_lock = threading.RLock()
+_cache = {}
+_stats = {}
+
+
+def _signature(path):
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _freeze(obj):
+    """Mark the buffers of ``obj`` read-only so sessions can't mutate them."""
+    if isinstance(obj, np.ndarray):
+        obj.setflags(write=False)
+    elif isinstance(obj, pd.DataFrame):
+        for values in getattr(obj._mgr, "arrays", []):
+            if isinstance(values, np.ndarray):
+                values.setflags(write=False)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            _freeze(item)
+    return obj
+
+
+def _load(name, paths, loader):
+    """Return the cached artifact ``name``, (re)loading it if ``paths`` changed."""
+    signature = tuple(_signature(path) for path in paths)
+    entry = _cache.get(name)
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+
+    with _lock:
+        entry = _cache.get(name)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        start = time.perf_counter()
+        value = _freeze(loader())
+        elapsed = time.perf_counter() - start
+        _cache[name] = (signature, value)
+        previous = _stats.get(name, {})
+        _stats[name] = {
+            "seconds": elapsed,
+            "loads": previous.get("loads", 0) + 1,
+            "loaded_at": time.time(),
+        }
+    return value
+
+
+def _read_pickle(path):
+    with open(path, "rb") as file:
+        return pickle.load(file)
+
+
+def load_stats():
+    """Load time (seconds), load count and timestamp of every loaded artifact."""
+    return {name: dict(stat) for name, stat in _stats.items()}
+
+
+def load_price_frame():
+    """Training features (``df.pkl``) used to populate the prediction form."""
+    path = MODELS_DIR / "df.pkl"
+    return _load("price_frame", [path], lambda: _read_pickle(path))
+
+
+def load_price_model():
+    """Fitted LightGBM price pipeline; predicts ``log1p(price)``."""
+    path = MODELS_DIR / "lightgbm_price_pipeline.pkl"
+    return _load("price_model", [path], lambda: _read_pickle(path))
+
+
+def load_fast_predictor():
+    """Single-row inference adapter for the price pipeline.
+
+    Uses ``models/fast_price_predictor.pkl`` when the training notebook has
+    exported one, otherwise derives it from the loaded pipeline, falling back
+    to scoring through the pipeline if it has steps the adapter can't export.
+    """
+    from fast_predictor import FastPricePredictor, PipelinePredictor
+
+    def export():
+        pipeline = load_price_model()
+        try:
+            return FastPricePredictor.from_pipeline(pipeline)
+        except TypeError:
+            return PipelinePredictor(pipeline)
+
+    path = MODELS_DIR / "fast_price_predictor.pkl"
+    if path.exists():
+        return _load("fast_predictor", [path], lambda: FastPricePredictor.load(path))
+    return _load(
+        "fast_predictor",
+        [MODELS_DIR / "lightgbm_price_pipeline.pkl"],
+        export,
+    )
+
+
+def price_model_fingerprint():
+    """SHA-256 of the price model artifacts currently on disk."""
+    paths = [MODELS_DIR / "lightgbm_price_pipeline.pkl", MODELS_DIR / "fast_price_predictor.pkl"]
+    paths = [path for path in paths if path.exists()]
+
+    def digest():
+        sha = hashlib.sha256()
+        for path in paths:
+            sha.update(path.read_bytes())
+        return sha.hexdigest()
+
+    return _load("price_model_fingerprint", paths, digest)
+
+
+def load_price_intervals():
+    """Calibrated residual table for price intervals, or None if not exported."""
+    from intervals import PriceIntervals
+
+    path = MODELS_DIR / "price_intervals.json"
+    if not path.exists():
+        return None
+    return _load("price_intervals", [path], lambda: PriceIntervals.load(path))
+
+
+def load_location_frame():
+    """Property x landmark distance matrix in metres, indexed by PropertyName."""
+    path = DATASETS_DIR / "Location_data.csv"
+    return _load(
+        "location_frame",
+        [path],
+        lambda: pd.read_csv(path).set_index("PropertyName"),
+    )
+
+
+def load_location_index():
+    """Sorted per-landmark distance index.
+
+    Uses ``datasets/location_index.npz`` from ``build_artifacts.py
+    location-index`` when present, otherwise builds it from the CSV.
+    """
+    from distance_index import LandmarkDistanceIndex
+
+    path = DATASETS_DIR / "location_index.npz"
+    if path.exists():
+        return _load("location_index", [path], lambda: LandmarkDistanceIndex.load(path))
+    return _load(
+        "location_index",
+        [DATASETS_DIR / "Location_data.csv"],
+        lambda: LandmarkDistanceIndex.from_frame(load_location_frame()),
+    )
+
+
+def load_proximity_search():
+    """Multi-landmark radius search with the landmark categories of
+    ``location_deduplication_mapping.csv``."""
+    from proximity import ProximitySearch, landmark_categories
+
+    mapping_path = DATASETS_DIR / "location_deduplication_mapping.csv"
+    sources = [DATASETS_DIR / "location_index.npz", DATASETS_DIR / "Location_data.csv"]
+
+    def build():
+        index = load_location_index()
+        return ProximitySearch(index, landmark_categories(pd.read_csv(mapping_path), index.landmarks))
+
+    return _load("proximity_search", [mapping_path] + [path for path in sources if path.exists()], build)
+
+
+def load_typeahead_index():
+    """Search-as-you-type index over landmark categories, landmarks and properties."""
+    from typeahead import TypeaheadIndex
+
+    mapping_path = DATASETS_DIR / "location_deduplication_mapping.csv"
+    sources = [DATASETS_DIR / "location_index.npz", DATASETS_DIR / "Location_data.csv"]
+
+    def build():
+        index = load_location_index()
+        return TypeaheadIndex.from_sources(
+            index.landmarks,
+            pd.read_csv(mapping_path),
+            index.names.tolist(),
+            load_proximity_search().categories,
+        )
+
+    return _load("typeahead_index", [mapping_path] + [path for path in sources if path.exists()], build)
+
+
+def load_property_details():
+    """Sub-location, link and facilities of each property, indexed by name."""
+    path = DATASETS_DIR / "property_detail.csv"
+    return _load(
+        "property_details",
+        [path],
+        lambda: pd.read_csv(path).set_index("PropertyName"),
+    )
+
+
+def load_property_catalog():
+    """ID-keyed catalog of the recommendable properties; see :mod:`catalog`.
+
+    Built once per change of its inputs.  Raises ``ValueError`` if an
+    exported artifact's rows don't follow the ``Location_data.csv`` order.
+    """
+    from catalog import PropertyCatalog
+
+    details_path = DATASETS_DIR / "property_detail.csv"
+    sources = [
+        DATASETS_DIR / "location_index.npz",
+        DATASETS_DIR / "Location_data.csv",
+        MODELS_DIR / "neighbour_index.npz",
+        MODELS_DIR / "property_features.npz",
+    ] + similarity_store_paths()
+
+    def build():
+        catalog = PropertyCatalog.build(load_location_index().names, load_property_details())
+        neighbours = load_neighbour_index()
+        if neighbours is not None:
+            catalog.verify("models/neighbour_index.npz", names=neighbours.names)
+        features = load_property_features()
+        if features is not None:
+            catalog.verify("models/property_features.npz", names=features[0])
+        if all(path.exists() for path in similarity_store_paths()):
+            for path, store in zip(similarity_store_paths(), load_similarity_sources()):
+                catalog.verify(f"models/{path.name}", length=len(store))
+        return catalog
+
+    return _load("property_catalog", [details_path] + [path for path in sources if path.exists()], build)
+
+
+def recommendation_version():
+    """Modification time and size of every recommendation artifact on disk.
+
+    Changes whenever one of them is rebuilt, so caches of recommendation
+    results can be keyed on it (object ids may be reused after a rebuild).
+    """
+    paths = [
+        DATASETS_DIR / "property_detail.csv",
+        DATASETS_DIR / "location_index.npz",
+        DATASETS_DIR / "Location_data.csv",
+        MODELS_DIR / "neighbour_index.npz",
+        MODELS_DIR / "property_features.npz",
+    ] + similarity_store_paths() + [MODELS_DIR / f"cosine_sim{i}.pkl" for i in (1, 2, 3)]
+    return tuple((path.name, _signature(path)) for path in paths if path.exists())
+
+
+def load_cosine_matrices():
+    """Facilities, price-detail and location similarity matrices, in that order."""
+    paths = [MODELS_DIR / f"cosine_sim{i}.pkl" for i in (1, 2, 3)]
+    return _load(
+        "cosine_matrices",
+        paths,
+        lambda: tuple(_read_pickle(path) for path in paths),
+    )
+
+
+def similarity_store_paths():
+    """Paths of the memory-mapped similarity stores, in ``cosine_sim`` order."""
+    return [MODELS_DIR / f"cosine_sim{i}.npy" for i in (1, 2, 3)]
+
+
+def load_similarity_sources():
+    """Facilities, price-detail and location similarity sources.
+
+    Prefers the memory-mapped stores written by ``build_artifacts.py
+    export-similarity``, shared between processes through the page cache, and
+    falls back to the dense pickles.
+    """
+    from similarity_store import MappedSimilarity
+
+    paths = similarity_store_paths()
+    if all(path.exists() for path in paths):
+        headers = [path.with_suffix(".json") for path in paths]
+        return _load(
+            "similarity_stores",
+            paths + headers,
+            lambda: tuple(MappedSimilarity(path) for path in paths),
+        )
+    return load_cosine_matrices()
+
+
+def load_blended_similarity():
+    """Default-weighted blend of the three cosine matrices, built once."""
+    from recommender import DEFAULT_WEIGHTS, blend
+
+    paths = [MODELS_DIR / f"cosine_sim{i}.pkl" for i in (1, 2, 3)]
+    return _load("blended_similarity", paths, lambda: blend(load_cosine_matrices(), DEFAULT_WEIGHTS))
+
+
+def load_neighbour_index():
+    """Precomputed top-K neighbour index, or None if it hasn't been built."""
+    from neighbour_index import NeighbourIndex
+
+    path = MODELS_DIR / "neighbour_index.npz"
+    if not path.exists():
+        return None
+    return _load("neighbour_index", [path], lambda: NeighbourIndex.load(path))
+
+
+def load_property_features():
+    """Per-property facilities, price-detail and location feature blocks.
+
+    Returns ``(names, blocks)`` from ``models/property_features.npz``, or None
+    if the recommendation notebook hasn't exported them.
+    """
+    path = MODELS_DIR / "property_features.npz"
+    if not path.exists():
+        return None
+
+    def read():
+        with np.load(path, allow_pickle=False) as data:
+            return data["names"], (data["facilities"], data["price"], data["location"])
+
+    return _load("property_features", [path], read)
+
+
+def load_ann_recommender():
+    """Index-backed recommender over the exported feature vectors, or None."""
+    from ann import AnnRecommender
+
+    path = MODELS_DIR / "property_features.npz"
+    if not path.exists():
+        return None
+
+    def build():
+        names, blocks = load_property_features()
+        return AnnRecommender(names, blocks)
+
+    return _load("ann_recommender", [path], build)
+
+
+def load_sector_coordinates():
+    """Mapping of sector name to ``{"lat": ..., "lng": ...}``."""
+    path = DATASETS_DIR / "sector_coordinates.json"
+
+    def read():
+        with open(path, "r") as f:
+            return json.load(f)
+
+    return _load("sector_coordinates", [path], read)
+
+
+def load_property_coordinates():
+    """Estimated ``lat``/``lng`` of each property with fit quality, or None.
+
+    Written by ``build_artifacts.py coordinates``; see :mod:`geolocate`.
+    """
+    path = DATASETS_DIR / "property_coordinates.csv"
+    if not path.exists():
+        return None
+    return _load("property_coordinates", [path], lambda: pd.read_csv(path).set_index("PropertyName"))
+
+
+def load_point_index():
+    """KD-tree over the estimated property coordinates, or None."""
+    from geolocate import PointIndex
+
+    path = DATASETS_DIR / "property_coordinates.csv"
+    if not path.exists():
+        return None
+    return _load("point_index", [path], lambda: PointIndex.from_frame(load_property_coordinates()))
+
+
+def load_analytics_frame():
+    """Listings for the dashboard with sector ``lat``/``lng`` already joined.
+
+    Reads the Feather file written by ``build_artifacts.py analytics`` when
+    present; otherwise prepares the same frame from the CSV.  Rows whose
+    sector has no known coordinates are dropped.
+    """
+    from analytics import prepare_analytics_frame, read_analytics
+
+    feather_path = DATASETS_DIR / "analytics.feather"
+    if feather_path.exists():
+        return _load("analytics_frame", [feather_path], lambda: read_analytics(feather_path))
+
+    path = DATASETS_DIR / "concatenated_properties_for analyzation.csv"
+    coordinates_path = DATASETS_DIR / "sector_coordinates.json"
+    return _load(
+        "analytics_frame",
+        [path, coordinates_path],
+        lambda: prepare_analytics_frame(pd.read_csv(path), load_sector_coordinates()),
+    )
+
+
+def load_analytics_cube():
+    """Dashboard aggregates; see :class:`analytics.AnalyticsCube`.
+
+    Uses ``datasets/analytics_cube.npz`` from ``build_artifacts.py analytics``
+    when present, otherwise aggregates :func:`load_analytics_frame`.
+    """
+    from analytics import AnalyticsCube
+
+    path = DATASETS_DIR / "analytics_cube.npz"
+    if path.exists():
+        return _load("analytics_cube", [path], lambda: AnalyticsCube.load(path))
+    sources = [DATASETS_DIR / "concatenated_properties_for analyzation.csv", DATASETS_DIR / "sector_coordinates.json"]
+    return _load("analytics_cube", sources, lambda: AnalyticsCube.build(load_analytics_frame()))
+
+
+def load_bitmap_index():
+    """Row filters over :func:`load_analytics_frame` with price prefixes at the
+    cube's bucket edges; see :class:`analytics.BitmapIndex`."""
+    from analytics import BitmapIndex
+
+    sources = [
+        DATASETS_DIR / "analytics.feather",
+        DATASETS_DIR / "concatenated_properties_for analyzation.csv",
+        DATASETS_DIR / "sector_coordinates.json",
+        DATASETS_DIR / "analytics_cube.npz",
+    ]
+    return _load(
+        "bitmap_index",
+        [path for path in sources if path.exists()],
+        lambda: BitmapIndex(load_analytics_frame(), load_analytics_cube().price_edges),
+    )
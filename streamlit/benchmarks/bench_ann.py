@@ -0,0 +1,67 @@
+"""Exact vs LSH recommendation search: latency and recall@k at growing N.
+
+Synthetic properties are drawn around shared cluster centres so that
+neighbourhoods are meaningful, with three feature blocks like the real
+facilities / price / location features.
+
+Run from the ``streamlit`` folder::
+
+    python -m benchmarks.bench_ann --sizes 10000 50000 200000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from ann import AnnRecommender, LSHIndex, recall_at_k
+
+
+def synthetic_blocks(n, dims, rng, clusters=500):
+    blocks = []
+    for dim in dims:
+        centres = rng.standard_normal((clusters, dim))
+        labels = rng.integers(0, clusters, n)
+        blocks.append((centres[labels] + 0.5 * rng.standard_normal((n, dim))).astype(np.float32))
+    return blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 200000])
+    parser.add_argument("--dims", type=int, nargs=3, default=[128, 64, 64])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--target", type=float, default=0.9, help="build-time recall@5 target for LSH")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'N':>8} {'build s':>8} {'tables':>7} {'exact us':>10} {'lsh us':>10} {'recall':>8}")
+    for n in args.sizes:
+        names = np.array([f"property {i}" for i in range(n)])
+        blocks = synthetic_blocks(n, args.dims, rng)
+        exact = AnnRecommender(names, blocks)
+        start = time.perf_counter()
+        approximate = AnnRecommender(names, blocks, exact_threshold=0, recall_target=args.target)
+        build = time.perf_counter() - start
+        # "exact" when no table count up to the limit reached the target
+        tables = len(approximate.index.tables) if isinstance(approximate.index, LSHIndex) else "exact"
+
+        queries = rng.integers(0, n, args.queries)
+        timings = {}
+        for label, engine in (("exact", exact), ("lsh", approximate)):
+            start = time.perf_counter()
+            for i in queries:
+                engine.search(int(i), args.k)
+            timings[label] = (time.perf_counter() - start) / len(queries) * 1e6
+
+        recall = recall_at_k(
+            lambda i, k: approximate.search(int(i), k),
+            lambda i, k: exact.search(int(i), k),
+            queries,
+            args.k,
+        )
+        print(f"{n:>8,} {build:>8.2f} {tables:>7} {timings['exact']:>10.0f} {timings['lsh']:>10.0f} {recall:>8.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Dashboard aggregates: pandas group-bys vs the pre-aggregated cube.
+
+Before timing, checks that the cube's ``select``/``total``/``mean`` match a
+pandas mask on the source listings, including listings priced exactly at a
+bucket edge, both in float64 and after a float32 downcast.  The listings
+are tiled to each row count; filters are random luxury, bedroom, 1-5 sector
+and price bucket range combinations.
+
+Run from the ``streamlit`` folder::
+
+    python -m benchmarks.bench_cube --rows 6000 600000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from analytics import AnalyticsCube
+from artifacts import load_analytics_frame
+
+
+def random_filters(cube, rng):
+    edges = len(cube.price_edges)
+    first, stop = sorted(rng.choice(edges, 2, replace=False))
+    return dict(
+        luxury=rng.choice(cube.luxury_labels + [None]),
+        bedroom=rng.choice(cube.bedrooms.tolist() + [None]),
+        sectors=list(rng.choice(cube.sectors, rng.integers(1, 6), replace=False)) if rng.random() < 0.5 else None,
+        buckets=(int(first), int(stop)),
+    )
+
+
+def pandas_mask(df, cube, luxury, bedroom, sectors, buckets):
+    """The dashboard's original chained filters, with the bucket range as prices."""
+    # Compared in the stored dtype, as ``df.price >= 3.3`` would be
+    edges = cube.price_edges.astype(df["price"].dtype)
+    mask = pd.Series(True, index=df.index)
+    if luxury is not None:
+        mask &= df["luxury_category"].astype(str) == luxury
+    if bedroom is not None:
+        mask &= df["bedRoom"] == bedroom
+    if sectors is not None:
+        mask &= df["sector"].astype(str).isin(sectors)
+    high = df["price"] <= edges[-1] if buckets[1] == len(edges) - 1 else df["price"] < edges[buckets[1]]
+    return mask & (df["price"] >= edges[buckets[0]]) & high
+
+
+def check_parity(df, rng, queries):
+    cube = AnalyticsCube.build(df)
+    for _ in range(queries):
+        filters = random_filters(cube, rng)
+        expected = df[pandas_mask(df, cube, **filters)]
+        cells = cube.select(**filters)
+        assert cube.total(cells) == len(expected), filters
+        if len(expected):
+            assert np.isclose(cube.mean(cells, "price"), expected["price"].mean()), filters
+            assert np.isclose(cube.mean(cells, "price_per_sqft"), expected["price_per_sqft"].mean()), filters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[6000, 600000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    base = load_analytics_frame()
+
+    # A third of the listings moved onto bucket edges
+    edges = AnalyticsCube.build(base).price_edges
+    on_edges = base.copy()
+    moved = rng.random(len(base)) < 1 / 3
+    on_edges.loc[moved, "price"] = rng.choice(edges[:-1], moved.sum())
+    for df in (base, on_edges, on_edges.astype({"price": np.float32, "price_per_sqft": np.float32})):
+        check_parity(df, rng, args.queries)
+    print(f"cube matches pandas on {3 * args.queries} filters, {moved.sum():,} listings priced at edges")
+
+    print(f"{'rows':>9} {'cells':>7} {'build s':>8} {'pandas ms':>10} {'cube ms':>8}")
+    for n in args.rows:
+        df = pd.concat([base] * -(-n // len(base)), ignore_index=True).iloc[:n]
+        start = time.perf_counter()
+        cube = AnalyticsCube.build(df)
+        build = time.perf_counter() - start
+
+        pandas_ms, cube_ms = [], []
+        for _ in range(args.queries):
+            filters = random_filters(cube, rng)
+
+            start = time.perf_counter()
+            filtered_df = df[pandas_mask(df, cube, **filters)]
+            filtered_df.groupby("sector", observed=True)[["price", "price_per_sqft"]].mean()
+            filtered_df["price"].median()
+            pandas_ms.append((time.perf_counter() - start) * 1e3)
+
+            start = time.perf_counter()
+            cells = cube.select(**filters)
+            cube.by_sector(cells)
+            cube.price_quantile(cells)
+            cube_ms.append((time.perf_counter() - start) * 1e3)
+        print(f"{n:>9,} {len(cube):>7,} {build:>8.2f} {np.median(pandas_ms):>10.2f} {np.median(cube_ms):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
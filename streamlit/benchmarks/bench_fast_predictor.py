@@ -0,0 +1,51 @@
+"""Single-listing latency: DataFrame + pipeline vs the fast predictor.
+
+Run from the ``streamlit`` folder::
+
+    python -m benchmarks.bench_fast_predictor --rows 500
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from artifacts import load_price_frame, load_price_model
+from fast_predictor import FastPricePredictor, max_relative_error
+
+
+def _latencies(fn, listings):
+    latencies = []
+    for listing in listings:
+        start = time.perf_counter()
+        fn(listing)
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    pipeline = load_price_model()
+    sample = load_price_frame().sample(args.rows, replace=True, random_state=42)
+    listings = sample.to_dict(orient="records")
+
+    start = time.perf_counter()
+    predictor = FastPricePredictor.from_pipeline(pipeline)
+    print(f"export: {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(f"max relative error vs pipeline: {max_relative_error(predictor, pipeline, sample):.2e}")
+
+    current = _latencies(lambda listing: np.expm1(pipeline.predict(pd.DataFrame([listing])))[0], listings)
+    fast = _latencies(predictor.predict, listings)
+    for name, latencies in (("pipeline", current), ("fast", fast)):
+        print(
+            f"{name:>8}: p50 {np.percentile(latencies, 50):8.1f} us"
+            f"  p99 {np.percentile(latencies, 99):8.1f} us"
+        )
+    print(f"speedup (p50): {np.percentile(current, 50) / np.percentile(fast, 50):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
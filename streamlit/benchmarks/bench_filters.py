@@ -0,0 +1,112 @@
+"""Dashboard filter latency: chained DataFrame masks vs packed bitmaps.
+
+The listings are tiled to each row count.  Filters are random luxury,
+bedroom, 1-5 sector and price bucket range combinations; both paths return the
+scatter plot's columns of the selected rows.  Before timing, the selected
+rows are checked against the original pandas filter for bounds at and
+between bucket edges, on listings priced exactly at edges, in float64 and
+after a float32 downcast.
+
+Run from the ``streamlit`` folder::
+
+    python -m benchmarks.bench_filters --rows 6000 600000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from analytics import BitmapIndex, price_edges
+from artifacts import load_analytics_frame
+
+COLUMNS = ['built_up_area', 'price', 'luxury_category', 'price_per_sqft', 'sector', 'bedRoom', 'bathroom']
+
+
+def chained(df, luxury, bedroom, sectors, low, high):
+    filtered_df = df.copy()
+    filtered_df = filtered_df[filtered_df['luxury_category'] == luxury]
+    filtered_df = filtered_df[filtered_df['bedRoom'] == bedroom]
+    filtered_df = filtered_df[(filtered_df['price'] >= low) & (filtered_df['price'] <= high)]
+    filtered_df = filtered_df[filtered_df['sector'].isin(sectors)]
+    return filtered_df[COLUMNS]
+
+
+def check_parity(df, rng, queries):
+    """Assert the bitmap rows equal the original Dashboard filter's rows."""
+    edges = price_edges(df['price'].to_numpy())
+    index = BitmapIndex(df, edges)
+    sectors = df['sector'].astype(str).unique()
+    for _ in range(queries):
+        low, high = (float(bound) for bound in sorted(rng.choice(edges, 2, replace=False)))
+        if rng.random() < 0.25:
+            # Bounds between edges take the price-check path
+            low, high = low * 1.001, high * 0.999
+        luxury = rng.choice(['Low', 'Medium', 'High', None])
+        bedroom = rng.choice([1, 2, 3, 4, None])
+        chosen = list(rng.choice(sectors, rng.integers(1, 6), replace=False)) if rng.random() < 0.5 else None
+
+        mask = (df['price'] >= low) & (df['price'] <= high)
+        if luxury is not None:
+            mask &= df['luxury_category'].astype(str) == luxury
+        if bedroom is not None:
+            mask &= df['bedRoom'] == bedroom
+        if chosen is not None:
+            mask &= df['sector'].astype(str).isin(chosen)
+        rows = index.select(luxury, bedroom, chosen, (low, high, True))
+        assert np.array_equal(rows, np.flatnonzero(mask.to_numpy())), (luxury, bedroom, chosen, low, high)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[6000, 600000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    base = load_analytics_frame()
+    sectors = base['sector'].astype(str).unique()
+
+    # A third of the listings moved onto bucket edges
+    edges = price_edges(base['price'].to_numpy())
+    on_edges = base.copy()
+    moved = rng.random(len(base)) < 1 / 3
+    on_edges.loc[moved, 'price'] = rng.choice(edges, moved.sum())
+    for df in (base, on_edges, on_edges.astype({'price': np.float32})):
+        check_parity(df, rng, args.queries)
+    print(f"bitmaps match the pandas filter on {3 * args.queries} filters, {moved.sum():,} listings priced at edges")
+
+    print(f"{'rows':>9} {'build s':>8} {'chained ms':>11} {'bitmap ms':>10} {'selected':>9}")
+    for n in args.rows:
+        df = pd.concat([base] * -(-n // len(base)), ignore_index=True).iloc[:n]
+        start = time.perf_counter()
+        edges = price_edges(df['price'].to_numpy())
+        index = BitmapIndex(df, edges)
+        build = time.perf_counter() - start
+
+        chained_ms, bitmap_ms, selected = [], [], []
+        for _ in range(args.queries):
+            luxury = rng.choice(['Low', 'Medium', 'High'])
+            bedroom = int(rng.integers(1, 5))
+            chosen = list(rng.choice(sectors, rng.integers(1, 6), replace=False))
+            low, high = sorted(rng.choice(edges, 2, replace=False))
+
+            start = time.perf_counter()
+            expected = chained(df, luxury, bedroom, chosen, low, high)
+            chained_ms.append((time.perf_counter() - start) * 1e3)
+
+            start = time.perf_counter()
+            rows = index.select(luxury, bedroom, chosen, (low, high, True))
+            result = index.take(rows, COLUMNS)
+            bitmap_ms.append((time.perf_counter() - start) * 1e3)
+
+            assert len(result) == len(expected)
+            selected.append(len(result))
+        print(
+            f"{n:>9,} {build:>8.2f} {np.median(chained_ms):>11.2f} {np.median(bitmap_ms):>10.2f} "
+            f"{np.mean(selected):>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Incremental neighbour-index update vs full rebuild at growing N.
+
+Synthetic feature blocks stand in for the encoded facilities, price and
+location features, so only the similarity and index maintenance is timed.
+Before timing, checks that a few in-distribution properties never ask for a
+full rebuild while a shifted batch does.
+
+Run from the ``streamlit`` folder::
+
+    python -m benchmarks.bench_incremental --sizes 1000 5000 20000 --new 10
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from incremental import IncrementalUpdater
+
+
+class _Encoded:
+    """Stand-in encoders returning pre-generated feature blocks."""
+
+    price_columns = range(16)
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+
+    def encode(self, rows):
+        return self.blocks
+
+    def oov_tokens(self, rows):
+        return 0, 0
+
+
+def _blocks(n, rng):
+    return [rng.standard_normal((n, dim)).astype(np.float32) for dim in (64, 16, 64)]
+
+
+def check_drift(rng, trials=20):
+    """In-distribution batches stay incremental; a 1-sigma price shift doesn't."""
+    names = np.array([f"property {i}" for i in range(300)])
+    blocks = _blocks(len(names), rng)
+    for new, shift, expected in [(1, 0.0, False), (5, 0.0, False), (50, 0.0, False), (50, 1.0, True)]:
+        for _ in range(trials):
+            added = _blocks(new, rng)
+            added[1] += shift
+            updater = IncrementalUpdater.build(_Encoded(added), names, blocks, k=10)
+            updater.add(pd.DataFrame(index=[f"new property {i}" for i in range(new)]))
+            assert updater.needs_rebuild == expected, (new, shift, updater.scaler_drift)
+    print(f"drift check passed ({trials} trials per case)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--new", type=int, default=10, help="properties added per update")
+    parser.add_argument("--k", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    check_drift(rng)
+    print(f"{'N':>8} {'full s':>10} {'incremental ms':>15} {'speedup':>9}")
+    for n in args.sizes:
+        names = np.array([f"property {i}" for i in range(n)])
+        blocks = _blocks(n, rng)
+        new_blocks = _blocks(args.new, rng)
+        new_names = np.array([f"new property {i}" for i in range(args.new)])
+
+        start = time.perf_counter()
+        updater = IncrementalUpdater.build(_Encoded(new_blocks), names, blocks, k=args.k)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        updater.add(pd.DataFrame(index=new_names))
+        incremental = time.perf_counter() - start
+
+        print(f"{n:>8,} {full:>10.2f} {incremental * 1000:>15.1f} {full / incremental:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Drive the price service over loopback and report latency and throughput.
+
+Run from the ``streamlit`` folder::
+
+    python -m benchmarks.bench_price_service --clients 32 --seconds 10
+
+Without ``--url`` an in-process server is started on a free port with the
+given batching settings.
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+from artifacts import load_price_frame
+from price_service import make_server
+
+
+def _client(url, bodies, stop, latencies, errors):
+    i = 0
+    while not stop.is_set():
+        request = urllib.request.Request(
+            url, data=bodies[i % len(bodies)], headers={"Content-Type": "application/json"}
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            errors.append(1)
+        i += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="existing /predict endpoint to benchmark")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--rows", type=int, default=1, help="listings per request")
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch", type=int, default=256)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server = make_server(port=0, window=args.window_ms / 1000, max_batch=args.max_batch)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/predict"
+
+    sample = load_price_frame().sample(1000, replace=True, random_state=42)
+    sample = sample.astype(object).where(sample.notna(), None)
+    records = sample.to_dict(orient="records")
+    bodies = [
+        json.dumps({"listings": records[i:i + args.rows]}).encode("utf-8")
+        for i in range(0, len(records) - args.rows + 1, args.rows)
+    ]
+
+    stop = threading.Event()
+    latencies, errors = [], []
+    clients = [
+        threading.Thread(target=_client, args=(url, bodies, stop, latencies, errors))
+        for _ in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for client in clients:
+        client.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        batcher = server.batcher
+        server.shutdown()
+        server.server_close()
+        batcher.stop()
+
+    latencies_ms = np.array(latencies) * 1000
+    print(f"clients={args.clients} rows/request={args.rows} window={args.window_ms}ms max_batch={args.max_batch}")
+    print(f"requests: {len(latencies):,} ok, {len(errors):,} failed in {elapsed:.1f}s")
+    if len(latencies_ms):
+        print(f"throughput: {len(latencies) / elapsed:,.0f} req/s, {len(latencies) * args.rows / elapsed:,.0f} listings/s")
+        print(f"latency: p50 {np.percentile(latencies_ms, 50):.2f} ms, p99 {np.percentile(latencies_ms, 99):.2f} ms")
+    if server is not None and batcher.batches:
+        print(f"batches: {batcher.batches:,}, mean {batcher.rows / batcher.batches:.1f} rows/batch")
+
+
+if __name__ == "__main__":
+    main()
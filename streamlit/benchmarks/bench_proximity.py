@@ -0,0 +1,70 @@
+"""Compound proximity query latency against a full-matrix boolean scan.
+
+Synthetic distances for N properties to 800 landmarks, grouped into a few
+categories, queried with three ``(target, radius)`` constraints.
+
+Run from the ``streamlit`` folder::
+
+    python -m benchmarks.bench_proximity --sizes 5000 50000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from distance_index import LandmarkDistanceIndex
+from proximity import ProximitySearch
+
+
+def synthetic_frame(n, landmarks, rng):
+    distances = rng.gamma(2.0, 6000.0, (n, landmarks)).astype(np.float32)
+    return pd.DataFrame(
+        distances,
+        index=pd.Index([f"property {i}" for i in range(n)], name="PropertyName"),
+        columns=[f"landmark {j}" for j in range(landmarks)],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 50000])
+    parser.add_argument("--landmarks", type=int, default=800)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'N':>8} {'build s':>8} {'scan ms':>8} {'index ms':>9} {'matches':>8}")
+    for n in args.sizes:
+        frame = synthetic_frame(n, args.landmarks, rng)
+        start = time.perf_counter()
+        index = LandmarkDistanceIndex.from_frame(frame)
+        categories = {
+            "Any metro station": index.landmarks[:20],
+            "Any hospital": index.landmarks[20:100],
+        }
+        search = ProximitySearch(index, categories)
+        build = time.perf_counter() - start
+
+        constraints = [("Any metro station", 2000), ("Any hospital", 3000), (index.landmarks[500], 10000)]
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            mask = (
+                (frame[categories["Any metro station"]].min(axis=1) < 2000)
+                & (frame[categories["Any hospital"]].min(axis=1) < 3000)
+                & (frame[index.landmarks[500]] < 10000)
+            )
+        scan = (time.perf_counter() - start) / args.repeat * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            result = search.query(constraints)
+        indexed = (time.perf_counter() - start) / args.repeat * 1000
+
+        assert len(result) == int(mask.sum())
+        print(f"{n:>8,} {build:>8.2f} {scan:>8.2f} {indexed:>9.3f} {len(result):>8,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Cost of a re-weighted recommendation query as the catalog grows.
+
+Each of the three similarity sources is simulated by unit-normalized random
+feature vectors, producing one row of cosines on demand, so the benchmark
+runs at catalog sizes whose dense N x N matrices would not fit in memory.
+Reports per-query latency and the peak extra memory of blend + top-k.
+
+Run from the ``streamlit`` folder::
+
+    python -m benchmarks.bench_row_blend --sizes 1000 10000 50000
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from recommender import blend_row, top_k
+
+
+class FeatureRows:
+    """Cosine similarity rows computed from unit-normalized feature vectors."""
+
+    def __init__(self, n, dim, rng):
+        features = rng.standard_normal((n, dim)).astype(np.float32)
+        self.features = features / np.linalg.norm(features, axis=1, keepdims=True)
+
+    def row(self, i):
+        return self.features @ self.features[i]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--dim", type=int, default=32)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'N':>8} {'p50 us':>10} {'p99 us':>10} {'peak KiB':>10} {'N x N MiB':>10}")
+    for n in args.sizes:
+        sources = [FeatureRows(n, args.dim, rng) for _ in range(3)]
+        queries = rng.integers(0, n, args.queries)
+        latencies = []
+        for i in queries:
+            weights = rng.random(3)
+            start = time.perf_counter()
+            top_k(blend_row(sources, weights, i), args.k, exclude=i)
+            latencies.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        top_k(blend_row(sources, rng.random(3), int(queries[0])), args.k, exclude=int(queries[0]))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        latencies = np.array(latencies) * 1e6
+        print(
+            f"{n:>8,} {np.percentile(latencies, 50):>10.1f} {np.percentile(latencies, 99):>10.1f}"
+            f" {peak / 1024:>10.0f} {n * n * 8 / 2**20:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
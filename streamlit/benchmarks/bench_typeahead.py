@@ -0,0 +1,56 @@
+"""Typeahead query latency over the real landmarks plus synthetic projects.
+
+Queries are random 3-8 character prefixes of indexed labels, some with one
+character dropped to mimic typos.
+
+Run from the ``streamlit`` folder::
+
+    python -m benchmarks.bench_typeahead --properties 246 50000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from artifacts import DATASETS_DIR, load_location_index
+from typeahead import TypeaheadIndex
+
+
+def queries(labels, n, rng):
+    result = []
+    for label in rng.choice(labels, n):
+        query = label[:rng.integers(3, 9)]
+        if len(query) > 3 and rng.random() < 0.3:
+            drop = rng.integers(1, len(query))
+            query = query[:drop] + query[drop + 1:]
+        result.append(query)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--properties", type=int, nargs="+", default=[246, 50000])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    landmarks = load_location_index().landmarks
+    mapping = pd.read_csv(DATASETS_DIR / "location_deduplication_mapping.csv")
+    print(f"{'entries':>8} {'build s':>8} {'median us':>10} {'p99 us':>8}")
+    for n in args.properties:
+        names = [f"{rng.choice(['DLF', 'M3M', 'Godrej', 'Sobha', 'Tata'])} Project {i}" for i in range(n)]
+        start = time.perf_counter()
+        index = TypeaheadIndex.from_sources(landmarks, mapping, names)
+        build = time.perf_counter() - start
+
+        timings = []
+        for query in queries(landmarks + names, args.queries, rng):
+            start = time.perf_counter()
+            index.search(query, 10)
+            timings.append((time.perf_counter() - start) * 1e6)
+        print(f"{len(index):>8,} {build:>8.2f} {np.median(timings):>10.0f} {np.percentile(timings, 99):>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Build the derived serving artifacts from the exported models and datasets.
+
+Run from the ``streamlit`` folder after re-running the notebooks::
+
+    python build_artifacts.py neighbours --k 50
+    python build_artifacts.py export-similarity --dtype uint8
+    python build_artifacts.py ann-recall --k 5
+    python build_artifacts.py add-properties new_projects.csv
+    python build_artifacts.py location-index
+    python build_artifacts.py coordinates
+    python build_artifacts.py analytics
+"""
+import argparse
+import time
+
+from ann import RECALL_TARGET
+from config import BASE_DIR
+from recommender import DEFAULT_WEIGHTS
+
+MODELS_DIR = BASE_DIR / "models"
+DATASETS_DIR = BASE_DIR / "datasets"
+
+
+def build_neighbours(args):
+    from artifacts import load_cosine_matrices, load_location_frame
+    from neighbour_index import NeighbourIndex
+
+    names = load_location_frame().index.to_numpy()
+    matrices = load_cosine_matrices()
+    index = NeighbourIndex.build(names, matrices, args.weights, args.k)
+    index.save(args.output)
+    print(f"Wrote top-{index.k} neighbours of {len(names)} properties to {args.output}")
+
+
+def export_similarity(args):
+    from artifacts import load_cosine_matrices, similarity_store_paths
+    from similarity_store import MappedSimilarity, export, topk_overlap
+
+    for matrix, path in zip(load_cosine_matrices(), similarity_store_paths()):
+        export(matrix, path, args.dtype)
+        store = MappedSimilarity(path)
+        overlap = topk_overlap(matrix, store, args.k)
+        print(
+            f"{path.name}: {matrix.nbytes / 2**20:.1f} MiB float64 -> "
+            f"{store.data.nbytes / 2**20:.1f} MiB {args.dtype}, top-{args.k} overlap {overlap:.2%}"
+        )
+
+
+def ann_recall(args):
+    import numpy as np
+
+    from ann import MAX_TABLES, AnnRecommender, LSHIndex, recall_at_k
+    from artifacts import load_cosine_matrices, load_location_frame, load_property_features
+    from recommender import blend_row, top_k
+
+    features = load_property_features()
+    if features is None:
+        raise SystemExit("models/property_features.npz not found; run Recommendation_System.ipynb first")
+    names, blocks = features
+    exact = AnnRecommender(names, blocks)
+    approximate = AnnRecommender(names, blocks, exact_threshold=0, recall_target=args.target)
+    if isinstance(approximate.index, LSHIndex):
+        print(f"LSH calibrated to {len(approximate.index.tables)} tables (sampled recall@5 {approximate.recall:.2%})")
+    else:
+        print(f"LSH missed recall@5 >= {args.target:.0%} with up to {MAX_TABLES} tables; the exact scan is kept")
+    queries = np.arange(len(names))
+    weights = tuple(args.weights)
+
+    def search(engine):
+        return lambda i, k: engine.search(i, k, weights)
+
+    lsh_recall = recall_at_k(search(approximate), search(exact), queries, args.k)
+    print(f"LSH vs exact index recall@{args.k}: {lsh_recall:.2%}")
+
+    # Compare against the dense cosine matrices where their rows line up by name
+    dense_names = load_location_frame().index
+    dense_ids = {name: i for i, name in enumerate(dense_names)}
+    shared = [i for i, name in enumerate(names) if name in dense_ids]
+    matrices = load_cosine_matrices()
+
+    def dense(i, k):
+        row = dense_ids[names[i]]
+        ids = top_k(blend_row(matrices, weights, row), k, exclude=row)
+        return np.array([exact.id_of(dense_names[j]) if dense_names[j] in exact else -1 for j in ids]), None
+
+    for label, engine in (("exact index", exact), ("LSH", approximate)):
+        recall = recall_at_k(search(engine), dense, shared, args.k)
+        print(f"{label} vs dense cosine matrices recall@{args.k}: {recall:.2%}")
+
+    if lsh_recall < args.target:
+        raise SystemExit(f"LSH recall@{args.k} {lsh_recall:.2%} is below the {args.target:.0%} target")
+
+
+def add_properties(args):
+    import pandas as pd
+
+    from artifacts import load_neighbour_index, load_property_features
+    from ann import AnnRecommender
+    from incremental import IncrementalUpdater, SimilarityEncoders
+
+    features = load_property_features()
+    if features is None:
+        raise SystemExit("models/property_features.npz not found; run Recommendation_System.ipynb first")
+    names, blocks = features
+    encoders = SimilarityEncoders.load(MODELS_DIR / "similarity_encoders.pkl")
+    index = load_neighbour_index()
+    # Scores merged into an index must come from the same feature vectors it was ranked from
+    if index is None or index.source != "features" or list(index.names) != list(names):
+        print("Neighbour index missing, built from the cosine matrices or out of sync with the features; rebuilding it")
+        updater = IncrementalUpdater.build(encoders, names, blocks, index.weights if index else DEFAULT_WEIGHTS)
+    else:
+        recommender = AnnRecommender(names, blocks, exact_threshold=len(names))
+        updater = IncrementalUpdater(encoders, recommender, index, index.weights)
+
+    rows = pd.read_csv(args.rows).set_index("PropertyName")
+    ids = updater.add(rows)
+    print(f"Added {len(ids)} properties; catalog now holds {len(updater.recommender)}")
+    print(f"Vocabulary OOV rate {updater.oov_rate:.1%}, price scaler drift z={updater.scaler_drift:.2f}")
+    if updater.needs_rebuild:
+        print("Drift threshold exceeded: re-run Recommendation_System.ipynb for a full rebuild")
+    updater.save(MODELS_DIR / "property_features.npz", MODELS_DIR / "neighbour_index.npz")
+
+
+def build_location_index(args):
+    from artifacts import load_location_frame
+    from distance_index import LandmarkDistanceIndex
+
+    index = LandmarkDistanceIndex.from_frame(load_location_frame())
+    index.save(args.output)
+    print(f"Wrote distances of {len(index.names)} properties to {len(index.landmarks)} landmarks to {args.output}")
+
+
+def build_coordinates(args):
+    import pandas as pd
+
+    from artifacts import load_location_frame, load_property_details, load_sector_coordinates
+    from geolocate import estimate_coordinates
+
+    mapping = pd.read_csv(DATASETS_DIR / "location_deduplication_mapping.csv")
+    coordinates = estimate_coordinates(
+        load_location_frame(), load_property_details(), mapping, load_sector_coordinates()
+    )
+    coordinates.to_csv(args.output)
+    print(f"Placed {len(coordinates)} properties in {args.output}")
+    print(coordinates["source"].value_counts().to_string())
+    print(f"median RMS residual: {coordinates['rms_m'].median():.0f} m")
+
+
+def build_analytics(args):
+    import pandas as pd
+
+    from analytics import AnalyticsCube, prepare_analytics_frame, write_analytics
+    from artifacts import load_sector_coordinates
+
+    source = DATASETS_DIR / "concatenated_properties_for analyzation.csv"
+    frame = prepare_analytics_frame(pd.read_csv(source), load_sector_coordinates())
+    write_analytics(frame, args.output)
+    size = frame.memory_usage(deep=True).sum() / 1e6
+    print(f"Wrote {len(frame):,} listings ({size:.1f} MB in memory) to {args.output}")
+
+    cube = AnalyticsCube.build(frame)
+    cube.save(args.cube_output)
+    print(f"Wrote {len(cube):,} non-empty cube cells to {args.cube_output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    neighbours = commands.add_parser("neighbours", help="top-K neighbour index for recommendations")
+    neighbours.add_argument("--k", type=int, default=50)
+    neighbours.add_argument(
+        "--weights", type=float, nargs=3, default=list(DEFAULT_WEIGHTS), metavar=("FACILITIES", "PRICE", "LOCATION")
+    )
+    neighbours.add_argument("--output", default=MODELS_DIR / "neighbour_index.npz")
+    neighbours.set_defaults(run=build_neighbours)
+
+    similarity = commands.add_parser(
+        "export-similarity", help="memory-mapped, quantized copies of the cosine pickles"
+    )
+    similarity.add_argument("--dtype", choices=["float32", "float16", "uint8"], default="float16")
+    similarity.add_argument("--k", type=int, default=5, help="top-k used for the overlap report")
+    similarity.set_defaults(run=export_similarity)
+
+    recall = commands.add_parser("ann-recall", help="recall@k of the feature-vector recommender")
+    recall.add_argument("--k", type=int, default=5)
+    recall.add_argument(
+        "--weights", type=float, nargs=3, default=list(DEFAULT_WEIGHTS), metavar=("FACILITIES", "PRICE", "LOCATION")
+    )
+    recall.add_argument("--target", type=float, default=RECALL_TARGET, help="fail below this LSH recall")
+    recall.set_defaults(run=ann_recall)
+
+    add = commands.add_parser("add-properties", help="append new properties without a full rebuild")
+    add.add_argument("rows", help="CSV of new properties: PropertyName, TopFacilitiesStr, price and landmark columns")
+    add.set_defaults(run=add_properties)
+
+    location = commands.add_parser("location-index", help="columnar, per-landmark sorted distance index")
+    location.add_argument("--output", default=DATASETS_DIR / "location_index.npz")
+    location.set_defaults(run=build_location_index)
+
+    coordinates = commands.add_parser("coordinates", help="estimate property lat/lng from landmark distances")
+    coordinates.add_argument("--output", default=DATASETS_DIR / "property_coordinates.csv")
+    coordinates.set_defaults(run=build_coordinates)
+
+    analytics = commands.add_parser("analytics", help="typed Feather copy and aggregate cube of the dashboard dataset")
+    analytics.add_argument("--output", default=DATASETS_DIR / "analytics.feather")
+    analytics.add_argument("--cube-output", default=DATASETS_DIR / "analytics_cube.npz")
+    analytics.set_defaults(run=build_analytics)
+
+    args = parser.parse_args()
+    start = time.perf_counter()
+    args.run(args)
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""ID-keyed property catalog shared by the recommendation artifacts.
+
+Property ``i`` is row ``i`` of ``Location_data.csv``, which is also row ``i``
+of the cosine matrices, the neighbour index and the exported feature
+vectors.  :class:`PropertyCatalog` makes that ID explicit, checks that every
+artifact it is given follows the same order, and keeps the display fields of
+``property_detail.csv`` in plain arrays with the facilities already parsed, so
+pages render cards without string parsing or ``DataFrame.loc``.
+"""
+import ast
+
+import numpy as np
+
+
+def parse_facilities(text):
+    """List of facility names from a ``TopFacilitiesStr`` value."""
+    if not isinstance(text, str) or not text.strip():
+        return []
+    try:
+        value = ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        value = text.strip("[]").split(", ")
+    if isinstance(value, str):
+        value = [value]
+    return [str(item).strip().strip("'").strip('"') for item in value if str(item).strip()]
+
+
+class PropertyCatalog:
+    """Stable integer IDs with O(1) lookups by ID and by name."""
+
+    def __init__(self, names, sub_names, links, facilities, has_details):
+        self.names = np.asarray(names)
+        self.sub_names = list(sub_names)
+        self.links = list(links)
+        self.facilities = [tuple(items) for items in facilities]
+        self.has_details = np.asarray(has_details, dtype=bool)
+        self._ids_by_name = {name: i for i, name in enumerate(self.names.tolist())}
+        if len(self._ids_by_name) != len(self.names):
+            raise ValueError("Property names must be unique")
+
+    @classmethod
+    def build(cls, names, details):
+        """Catalog in the order of ``names`` with the fields of ``details``.
+
+        ``details`` is ``property_detail.csv`` indexed by PropertyName;
+        properties missing from it get empty fields.
+        """
+        names = np.asarray(names)
+        details = details.reindex(names)
+        has_details = details["Link"].notna().to_numpy() | details["PropertySubName"].notna().to_numpy()
+        return cls(
+            names,
+            [str(value).strip() if isinstance(value, str) else "" for value in details["PropertySubName"]],
+            [value if isinstance(value, str) else "" for value in details["Link"]],
+            [parse_facilities(value) for value in details["TopFacilitiesStr"]],
+            has_details,
+        )
+
+    def __contains__(self, name):
+        return name in self._ids_by_name
+
+    def __len__(self):
+        return len(self.names)
+
+    def id_of(self, name):
+        return self._ids_by_name[name]
+
+    def name_of(self, property_id):
+        return self.names[property_id]
+
+    def verify(self, artifact, names=None, length=None):
+        """Raise ``ValueError`` unless ``artifact`` rows follow catalog IDs.
+
+        ``names`` are the artifact's row names; properties appended after the
+        catalog's (see ``build_artifacts.py add-properties``) are allowed.
+        ``length`` alone checks a matrix with unnamed rows.
+        """
+        if names is not None:
+            names = np.asarray(names)
+            if len(names) < len(self.names) or not np.array_equal(names[:len(self.names)], self.names):
+                raise ValueError(f"{artifact} rows are not in Location_data.csv order; rebuild it")
+        if length is not None and length != len(self.names):
+            raise ValueError(f"{artifact} has {length} rows, expected {len(self.names)}; rebuild it")
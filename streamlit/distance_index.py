@@ -0,0 +1,85 @@
+"""Sorted per-landmark distance index for radius searches.
+
+``Location_data.csv`` is a property x landmark distance matrix in metres,
+with ``54000`` standing in for "no distance listed".  The build step stores
+it column by column as float32 together with, per landmark, the property IDs
+sorted by distance.  A radius query is then a binary search plus a slice,
+already ordered nearest-first.
+
+Property IDs are the row positions of ``Location_data.csv``, the same order
+the similarity matrices follow.
+"""
+import numpy as np
+import pandas as pd
+
+MISSING_DISTANCE = 54000
+FORMAT_VERSION = 1
+
+
+class LandmarkDistanceIndex:
+    """Columnar distances plus per-landmark nearest-first orderings."""
+
+    def __init__(self, names, landmarks, distances, order, sorted_distances):
+        self.names = np.asarray(names)
+        self.landmarks = list(landmarks)
+        self.distances = np.asarray(distances, dtype=np.float32)
+        self.order = np.asarray(order, dtype=np.int32)
+        self.sorted_distances = np.asarray(sorted_distances, dtype=np.float32)
+        self._landmark_ids = {name: j for j, name in enumerate(self.landmarks)}
+        self._ids_by_name = {name: i for i, name in enumerate(self.names.tolist())}
+
+    @classmethod
+    def from_frame(cls, location_df):
+        """Build from the distance frame indexed by PropertyName."""
+        location_df = location_df[sorted(location_df.columns)]
+        # One contiguous row per landmark; missing distances never match
+        distances = location_df.to_numpy(dtype=np.float32).T.copy()
+        distances[distances == MISSING_DISTANCE] = np.inf
+        order = np.argsort(distances, axis=1, kind="stable").astype(np.int32)
+        sorted_distances = np.take_along_axis(distances, order, axis=1)
+        return cls(location_df.index.to_numpy(), location_df.columns, distances, order, sorted_distances)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) != FORMAT_VERSION:
+                raise ValueError(f"Unsupported location index version in {path}")
+            return cls(
+                data["names"], data["landmarks"].tolist(), data["distances"],
+                data["order"], data["sorted_distances"],
+            )
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            np.savez(
+                file,
+                format_version=np.int32(FORMAT_VERSION),
+                names=self.names.astype(str),
+                landmarks=np.asarray(self.landmarks, dtype=str),
+                distances=self.distances,
+                order=self.order,
+                sorted_distances=self.sorted_distances,
+            )
+
+    def __contains__(self, name):
+        return name in self._ids_by_name
+
+    def id_of(self, name):
+        return self._ids_by_name[name]
+
+    def landmark_id(self, landmark):
+        return self._landmark_ids[landmark]
+
+    def within(self, landmark, meters):
+        """IDs and distances of properties closer than ``meters``, nearest first."""
+        j = self.landmark_id(landmark)
+        stop = np.searchsorted(self.sorted_distances[j], meters, side="left")
+        return self.order[j, :stop], self.sorted_distances[j, :stop]
+
+    def radius_frame(self, landmark, meters):
+        """:meth:`within` as a frame indexed by PropertyName with one distance column."""
+        ids, distances = self.within(landmark, meters)
+        return pd.DataFrame(
+            {landmark: distances},
+            index=pd.Index(self.names[ids], name="PropertyName"),
+        )
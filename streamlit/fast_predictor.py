@@ -0,0 +1,245 @@
+"""Low-latency inference for the fitted price pipeline.
+
+For a single listing, ``pipeline.predict`` spends most of its time building a
+DataFrame and running the ``ColumnTransformer``, not in the LightGBM trees.
+:class:`FastPricePredictor` is exported from the fitted pipeline once: it
+keeps the scaler constants and category -> code lookup tables and encodes a
+plain dict or tuple straight into a NumPy feature vector for the booster.
+
+Predictions match ``np.expm1(pipeline.predict(frame))`` to float tolerance;
+see :func:`max_relative_error`.  Pipelines with steps the adapter can't
+export raise ``TypeError`` from :meth:`FastPricePredictor.from_pipeline`;
+:class:`PipelinePredictor` serves them through the pipeline itself.
+"""
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from pricing import FEATURE_COLUMNS, predict_prices
+
+
+class _Numeric:
+    """Scaled (or passed through) numeric input columns."""
+
+    def __init__(self, columns, offset, mean=None, scale=None):
+        self.columns = list(columns)
+        self.offset = offset
+        self.width = len(self.columns)
+        self.mean = np.zeros(self.width) if mean is None else np.asarray(mean, dtype=float)
+        self.scale = np.ones(self.width) if scale is None else np.asarray(scale, dtype=float)
+
+    def encode(self, row, out):
+        for i, column in enumerate(self.columns):
+            out[self.offset + i] = (float(row[column]) - self.mean[i]) / self.scale[i]
+
+    def encode_frame(self, frame, out):
+        values = frame[self.columns].to_numpy(dtype=float)
+        out[:, self.offset:self.offset + self.width] = (values - self.mean) / self.scale
+
+
+class _Ordinal:
+    """Ordinal-encoded categorical columns, unknowns mapped to ``unknown``."""
+
+    def __init__(self, columns, offset, categories, unknown):
+        self.columns = list(columns)
+        self.offset = offset
+        self.width = len(self.columns)
+        self.codes = [{value: float(code) for code, value in enumerate(cats)} for cats in categories]
+        self.unknown = unknown
+
+    def _unknown(self, column, value):
+        if self.unknown is None:
+            raise ValueError(f"Unknown category {value!r} in column {column!r}")
+        return self.unknown
+
+    def encode(self, row, out):
+        for i, column in enumerate(self.columns):
+            value = row[column]
+            code = self.codes[i].get(value)
+            out[self.offset + i] = self._unknown(column, value) if code is None else code
+
+    def encode_frame(self, frame, out):
+        for i, column in enumerate(self.columns):
+            codes = frame[column].map(self.codes[i])
+            if codes.isna().any():
+                codes = codes.fillna(self._unknown(column, frame[column][codes.isna()].iloc[0]))
+            out[:, self.offset + i] = codes.to_numpy(dtype=float)
+
+
+class _OneHot:
+    """One-hot encoded columns; dropped and unknown categories stay all-zero."""
+
+    def __init__(self, columns, offset, categories, drop_idx, ignore_unknown):
+        self.columns = list(columns)
+        self.offset = offset
+        self.positions = []
+        position = offset
+        for i, cats in enumerate(categories):
+            dropped = None if drop_idx is None else drop_idx[i]
+            lookup = {}
+            for code, value in enumerate(cats):
+                if dropped is not None and code == dropped:
+                    lookup[value] = -1
+                else:
+                    lookup[value] = position
+                    position += 1
+            self.positions.append(lookup)
+        self.width = position - offset
+        self.ignore_unknown = ignore_unknown
+
+    def _position(self, i, value):
+        position = self.positions[i].get(value)
+        if position is None:
+            if not self.ignore_unknown:
+                raise ValueError(f"Unknown category {value!r} in column {self.columns[i]!r}")
+            return -1
+        return position
+
+    def encode(self, row, out):
+        for i, column in enumerate(self.columns):
+            position = self._position(i, row[column])
+            if position >= 0:
+                out[position] = 1.0
+
+    def encode_frame(self, frame, out):
+        rows = np.arange(len(frame))
+        for i, column in enumerate(self.columns):
+            positions = frame[column].map(self.positions[i])
+            if positions.isna().any():
+                self._position(i, frame[column][positions.isna()].iloc[0])
+                positions = positions.fillna(-1)
+            positions = positions.to_numpy(dtype=np.int64)
+            hit = positions >= 0
+            out[rows[hit], positions[hit]] = 1.0
+
+
+def _encoder(name, transformer, columns, offset):
+    from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+    if transformer == "passthrough":
+        return _Numeric(columns, offset)
+    if isinstance(transformer, StandardScaler):
+        return _Numeric(
+            columns,
+            offset,
+            transformer.mean_ if transformer.with_mean else None,
+            transformer.scale_ if transformer.with_std else None,
+        )
+    if isinstance(transformer, OrdinalEncoder):
+        unknown = None
+        if transformer.handle_unknown == "use_encoded_value":
+            unknown = float(transformer.unknown_value)
+        return _Ordinal(columns, offset, transformer.categories_, unknown)
+    if isinstance(transformer, OneHotEncoder):
+        if getattr(transformer, "_infrequent_enabled", False):
+            raise TypeError(f"Step {name!r}: OneHotEncoder with infrequent categories is not supported")
+        return _OneHot(
+            columns,
+            offset,
+            transformer.categories_,
+            transformer.drop_idx_,
+            transformer.handle_unknown == "ignore",
+        )
+    raise TypeError(f"Step {name!r}: unsupported transformer {type(transformer).__name__}")
+
+
+class FastPricePredictor:
+    """Encode listings without pandas and score them with the raw booster."""
+
+    def __init__(self, encoders, width, booster, num_iteration=None):
+        self.encoders = encoders
+        self.width = width
+        self.booster = booster
+        self.num_iteration = num_iteration
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        """Export the adapter from a fitted ``Pipeline([preprocessor, LGBMRegressor])``."""
+        preprocessor = pipeline[-2]
+        regressor = pipeline[-1]
+        if not hasattr(regressor, "booster_"):
+            raise TypeError(f"Expected a fitted LightGBM regressor, got {type(regressor).__name__}")
+
+        input_columns = list(getattr(preprocessor, "feature_names_in_", FEATURE_COLUMNS))
+        encoders, offset = [], 0
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == "drop" or len(columns) == 0:
+                continue
+            columns = [input_columns[c] if isinstance(c, (int, np.integer)) else c for c in columns]
+            encoder = _encoder(name, transformer, columns, offset)
+            encoders.append(encoder)
+            offset += encoder.width
+
+        return cls(encoders, offset, regressor.booster_)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return pickle.load(file)
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            pickle.dump(self, file)
+
+    def encode(self, listing):
+        """Feature vector for one listing given as a dict or a tuple in
+        :data:`pricing.FEATURE_COLUMNS` order."""
+        if not isinstance(listing, dict):
+            listing = dict(zip(FEATURE_COLUMNS, listing))
+        vector = np.zeros(self.width)
+        for encoder in self.encoders:
+            encoder.encode(listing, vector)
+        return vector
+
+    def encode_frame(self, frame):
+        """Feature matrix for every row of ``frame``."""
+        matrix = np.zeros((len(frame), self.width))
+        for encoder in self.encoders:
+            encoder.encode_frame(frame, matrix)
+        return matrix
+
+    def predict_log(self, listing):
+        """Raw model output, ``log1p(price)``, for one listing."""
+        vector = self.encode(listing).reshape(1, -1)
+        return float(self.booster.predict(vector, num_iteration=self.num_iteration)[0])
+
+    def predict(self, listing):
+        """Predicted price in Cr for one listing."""
+        return float(np.expm1(self.predict_log(listing)))
+
+    def predict_frame(self, frame):
+        """Predicted prices in Cr for every row of ``frame``."""
+        if len(frame) == 0:
+            return np.empty(0)
+        matrix = self.encode_frame(frame)
+        return np.expm1(self.booster.predict(matrix, num_iteration=self.num_iteration))
+
+
+class PipelinePredictor:
+    """Same interface as :class:`FastPricePredictor`, scoring through the
+    fitted pipeline for pipelines that can't be exported."""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def predict(self, listing):
+        """Predicted price in Cr for one listing."""
+        return float(self.predict_frame(pd.DataFrame([listing], columns=FEATURE_COLUMNS))[0])
+
+    def predict_frame(self, frame):
+        """Predicted prices in Cr for every row of ``frame``."""
+        return predict_prices(self.pipeline, frame[FEATURE_COLUMNS])
+
+
+def max_relative_error(predictor, pipeline, frame):
+    """Largest relative gap between the adapter and ``np.expm1(pipeline.predict)``."""
+    frame = frame[FEATURE_COLUMNS]
+    expected = np.expm1(pipeline.predict(frame))
+    single = np.array([predictor.predict(row) for row in frame.to_dict(orient="records")])
+    batched = predictor.predict_frame(frame)
+    scale = np.maximum(np.abs(expected), 1e-12)
+    return float(max(
+        (np.abs(single - expected) / scale).max(),
+        (np.abs(batched - expected) / scale).max(),
+    ))
@@ -0,0 +1,189 @@
+"""Property coordinates recovered from landmark distances, and point search.
+
+The datasets only give property -> landmark distances and sector centroids.
+Landmarks whose name places them in a known sector or locality ("Euro
+International School, Sector 84", "Sohna Rd") take that centroid as their
+position.  Each property is then placed by least-squares trilateration
+against its landmarks, starting from (and softly anchored to) the centroid of
+its own sector.  ``rms_m`` is the root-mean-square gap between the listed and
+the fitted landmark distances, so it grows when the listed distances can't be
+reconciled with one position.
+
+:class:`PointIndex` answers "within R km of this point" with a KD-tree over
+unit vectors on the sphere instead of scanning the distance matrix.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_M = 6371000.0
+MISSING_DISTANCE = 54000
+
+# Non-sector keys of sector_coordinates.json that name a place, not a developer
+LOCALITIES = (
+    "sohna road", "gwal pahari", "manesar", "badshahpur", "palam", "sushant lok",
+    "dwarka expressway", "jacobpura", "maruti kunj",
+)
+# A landmark's listed position is a sector centroid, so it is only ~1 km exact
+LANDMARK_SIGMA_M = 1000.0
+SEED_SIGMA_M = 2000.0
+
+_SECTOR = re.compile(r"\b(?:sector|sec)[\s.-]*(\d+)([a-z]?)\b", re.IGNORECASE)
+_LOCALITY = re.compile(r"\b(" + "|".join(map(re.escape, LOCALITIES)) + r")\b", re.IGNORECASE)
+_ABBREVIATIONS = (
+    (re.compile(r"\brd\b", re.IGNORECASE), "road"),
+    (re.compile(r"\bexpy\b", re.IGNORECASE), "expressway"),
+)
+
+
+def place_of(text, sector_coordinates):
+    """Key of ``sector_coordinates`` that ``text`` refers to, or None."""
+    for number, suffix in _SECTOR.findall(text):
+        for key in (f"sector {number}{suffix.lower()}", f"sector {number}"):
+            if key in sector_coordinates:
+                return key
+    for pattern, replacement in _ABBREVIATIONS:
+        text = pattern.sub(replacement, text)
+    match = _LOCALITY.search(text)
+    if match and match.group(1).lower() in sector_coordinates:
+        return match.group(1).lower()
+    return None
+
+
+def landmark_coordinates(mapping, sector_coordinates):
+    """Landmark -> ``(lat, lng)`` for landmarks placed by their name.
+
+    A canonical landmark is placed only when its name and every spelling
+    variant that names a place agree; merged variants naming different
+    sectors are usually branches of a chain.
+    """
+    coordinates = {}
+    for canonical, variants in zip(mapping["Canonical_Location"], mapping["All_Variants"].fillna("")):
+        places = {place_of(text, sector_coordinates) for text in [canonical] + variants.split(" | ")}
+        places.discard(None)
+        if len(places) == 1:
+            point = sector_coordinates[places.pop()]
+            coordinates[canonical] = (point["lat"], point["lng"])
+    return coordinates
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    """Great-circle distance in metres; broadcasts over arrays."""
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def trilaterate(seed, anchors, distances, iterations=20):
+    """Gauss-Newton fit of one position to landmark distances.
+
+    ``seed`` is ``(lat, lng)``, ``anchors`` an ``(n, 2)`` array of landmark
+    ``(lat, lng)`` and ``distances`` their listed distances in metres.  The
+    seed also enters as a prior so that one or two landmarks still give a
+    stable answer.  Returns ``(lat, lng, rms_m)``.
+    """
+    lat0, lng0 = seed
+    ky = EARTH_RADIUS_M * np.pi / 180
+    kx = ky * np.cos(np.radians(lat0))
+    points = np.column_stack([(anchors[:, 1] - lng0) * kx, (anchors[:, 0] - lat0) * ky])
+    prior = LANDMARK_SIGMA_M / SEED_SIGMA_M
+
+    position = np.zeros(2)
+    for _ in range(iterations):
+        offsets = position - points
+        ranges = np.maximum(np.hypot(offsets[:, 0], offsets[:, 1]), 1.0)
+        jacobian = np.vstack([offsets / ranges[:, None], prior * np.eye(2)])
+        residuals = np.concatenate([ranges - distances, prior * position])
+        step = np.linalg.lstsq(jacobian, -residuals, rcond=None)[0]
+        position += step
+        if np.hypot(*step) < 0.5:
+            break
+
+    fitted = np.hypot(*(position - points).T)
+    rms = float(np.sqrt(np.mean((fitted - distances) ** 2)))
+    return lat0 + position[1] / ky, lng0 + position[0] / kx, rms
+
+
+def estimate_coordinates(location_df, details, mapping, sector_coordinates):
+    """Estimated ``lat``/``lng`` of every property in ``location_df``.
+
+    Returns a frame indexed by PropertyName with ``lat``, ``lng``,
+    ``landmarks`` (number used), ``rms_m`` and ``source``: ``trilaterated``,
+    ``sector`` (no placed landmark, sector centroid kept) or ``landmarks``
+    (no known sector, seeded from the landmark mean).  Properties with
+    neither a sector nor a placed landmark are left out.
+    """
+    anchors = landmark_coordinates(mapping, sector_coordinates)
+    columns = [column for column in location_df.columns if column in anchors]
+    anchor_points = np.array([anchors[column] for column in columns])
+    distances = location_df[columns].to_numpy(dtype=float)
+    sub_names = details["PropertySubName"].reindex(location_df.index).fillna("")
+
+    records = []
+    for i, name in enumerate(location_df.index):
+        known = np.isfinite(distances[i]) & (distances[i] != MISSING_DISTANCE)
+        place = place_of(f"{sub_names[name]} | {name}", sector_coordinates)
+        if place is not None:
+            seed = (sector_coordinates[place]["lat"], sector_coordinates[place]["lng"])
+            source = "trilaterated" if known.any() else "sector"
+        elif known.any():
+            seed = tuple(anchor_points[known].mean(axis=0))
+            source = "landmarks"
+        else:
+            continue
+        if known.any():
+            lat, lng, rms = trilaterate(seed, anchor_points[known], distances[i, known])
+        else:
+            (lat, lng), rms = seed, np.nan
+        records.append((name, lat, lng, int(known.sum()), rms, source))
+
+    return pd.DataFrame.from_records(
+        records, columns=["PropertyName", "lat", "lng", "landmarks", "rms_m", "source"]
+    ).set_index("PropertyName")
+
+
+def _unit_vectors(lat, lng):
+    lat, lng = np.radians(lat), np.radians(lng)
+    return np.column_stack([np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat)])
+
+
+class PointIndex:
+    """KD-tree over property positions for radius and nearest queries."""
+
+    def __init__(self, names, lat, lng):
+        from scipy.spatial import cKDTree
+
+        self.names = np.asarray(names)
+        self.lat = np.asarray(lat, dtype=float)
+        self.lng = np.asarray(lng, dtype=float)
+        self.tree = cKDTree(_unit_vectors(self.lat, self.lng))
+
+    @classmethod
+    def from_frame(cls, coordinates):
+        return cls(coordinates.index.to_numpy(), coordinates["lat"], coordinates["lng"])
+
+    def _frame(self, ids, lat, lng):
+        ids = np.asarray(ids, dtype=np.int64)
+        distances = haversine_m(lat, lng, self.lat[ids], self.lng[ids])
+        order = np.argsort(distances, kind="stable")
+        return pd.DataFrame(
+            {"distance": distances[order]},
+            index=pd.Index(self.names[ids[order]], name="PropertyName"),
+        )
+
+    def within(self, lat, lng, meters):
+        """Properties closer than ``meters`` to the point, nearest first.
+
+        Returns a frame indexed by PropertyName with ``distance`` in metres.
+        """
+        chord = 2 * np.sin(min(meters / EARTH_RADIUS_M, np.pi) / 2)
+        ids = self.tree.query_ball_point(_unit_vectors([lat], [lng])[0], chord)
+        result = self._frame(ids, lat, lng)
+        return result[result["distance"] < meters]
+
+    def nearest(self, lat, lng, k=5):
+        """The ``k`` properties nearest to the point, same frame as :meth:`within`."""
+        k = min(k, len(self.names))
+        _, ids = self.tree.query(_unit_vectors([lat], [lng])[0], k=k)
+        return self._frame(np.atleast_1d(ids), lat, lng)
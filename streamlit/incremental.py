@@ -0,0 +1,179 @@
+"""Incremental similarity updates when new properties are added.
+
+Re-running ``Recommendation_System.ipynb`` end to end for one new project
+refits the TF-IDF vectorizer and recomputes every N x N matrix.  The
+:class:`IncrementalUpdater` instead encodes only the new rows with the
+encoders fitted by the notebook, scores them against the existing catalog
+(O(N) per new property) and merges them into the feature store and the
+top-K neighbour index.
+
+A full rebuild is only needed once the new rows drift away from what the
+encoders were fitted on: too many facility terms missing from the TF-IDF
+vocabulary, or price features whose standardized mean has moved by more
+than sampling noise explains.  Standardized features have unit variance on
+the training data, so the mean of ``m`` new rows has standard error
+``1 / sqrt(m)``; drift is that mean as a z-score, and is only judged once
+:data:`MIN_DRIFT_ROWS` rows have been added.
+"""
+import pickle
+
+import numpy as np
+
+from ann import AnnRecommender, normalize_rows
+from neighbour_index import NeighbourIndex
+from recommender import DEFAULT_WEIGHTS, top_k
+
+MAX_OOV_RATE = 0.2
+MAX_SCALER_DRIFT_Z = 4.0
+MIN_DRIFT_ROWS = 30
+
+
+class SimilarityEncoders:
+    """Fitted encoders of the three similarity sources.
+
+    ``rows`` passed to :meth:`encode` are indexed by PropertyName and hold
+    ``TopFacilitiesStr`` (space-joined facilities), the one-hot price-detail
+    columns and the landmark distance columns in metres, encoded exactly as
+    the notebook does (missing values filled with 0).
+    """
+
+    def __init__(self, tfidf, price_scaler, price_columns, location_columns, svd=None):
+        self.tfidf = tfidf
+        self.svd = svd
+        self.price_scaler = price_scaler
+        self.price_columns = list(price_columns)
+        self.location_columns = list(location_columns)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return cls(**pickle.load(file))
+
+    def encode(self, rows):
+        """Facilities, price and location feature blocks of ``rows``."""
+        facilities = self.tfidf.transform(rows["TopFacilitiesStr"].fillna(""))
+        facilities = self.svd.transform(facilities) if self.svd is not None else facilities.toarray()
+        price = self.price_scaler.transform(rows.reindex(columns=self.price_columns).fillna(0))
+        # Same inverse-distance features as the notebook, which fills gaps with 0 m
+        distances = rows.reindex(columns=self.location_columns).fillna(0).to_numpy(dtype=float)
+        location = 1 / (distances + 1)
+        return facilities, price, location
+
+    def oov_tokens(self, rows):
+        """Total and out-of-vocabulary token counts of the facility texts."""
+        analyzer = self.tfidf.build_analyzer()
+        vocabulary = self.tfidf.vocabulary_
+        total = missing = 0
+        for text in rows["TopFacilitiesStr"].fillna(""):
+            tokens = analyzer(text)
+            total += len(tokens)
+            missing += sum(token not in vocabulary for token in tokens)
+        return total, missing
+
+
+class IncrementalUpdater:
+    """Append properties to the feature store and neighbour index in place."""
+
+    def __init__(self, encoders, recommender, neighbours, weights=DEFAULT_WEIGHTS):
+        if neighbours.source != "features":
+            raise ValueError("Neighbour index was not ranked from the feature vectors; rebuild it with build()")
+        self.encoders = encoders
+        self.recommender = recommender
+        self.neighbours = neighbours
+        self.weights = tuple(weights)
+        self.added = 0
+        self._tokens = 0
+        self._oov = 0
+        self._price_sum = np.zeros(len(encoders.price_columns))
+
+    @classmethod
+    def build(cls, encoders, names, blocks, weights=DEFAULT_WEIGHTS, k=50):
+        """Full rebuild: exact top-``k`` of every property from its features."""
+        recommender = AnnRecommender(names, blocks, exact_threshold=len(names))
+        n = len(recommender)
+        indices = np.full((n, k), -1, dtype=np.int32)
+        scores = np.full((n, k), np.nan, dtype=np.float32)
+        for i in range(n):
+            ids, found = recommender.search(i, k, weights)
+            indices[i, :len(ids)] = ids
+            scores[i, :len(ids)] = found
+        return cls(encoders, recommender, NeighbourIndex(names, indices, scores, weights, "features"), weights)
+
+    def _weighted(self, vectors):
+        weighted = vectors.copy()
+        for block, weight in zip(self.recommender.slices, self.weights):
+            weighted[:, block] *= weight
+        return weighted
+
+    def add(self, rows):
+        """Encode ``rows``, score them against the catalog and merge them in.
+
+        Returns the IDs assigned to the new properties.
+        """
+        names = rows.index.to_numpy()
+        duplicates = [name for name in names if name in self.recommender]
+        if duplicates:
+            raise ValueError(f"Already in the catalog: {', '.join(map(str, duplicates))}")
+
+        blocks = self.encoders.encode(rows)
+        tokens, oov = self.encoders.oov_tokens(rows)
+        self._tokens += tokens
+        self._oov += oov
+        self._price_sum += np.asarray(blocks[1]).sum(axis=0)
+        self.added += len(rows)
+
+        old_n = len(self.recommender)
+        new_ids = self.recommender.add(names, blocks)
+        queries = self._weighted(self.recommender.vectors[new_ids])
+        # (N + m) x m similarities of every property to the new ones
+        similarities = self.recommender.vectors @ queries.T
+        similarities[new_ids, np.arange(len(new_ids))] = -np.inf
+
+        k = self.neighbours.k
+        new_indices = np.full((len(new_ids), k), -1, dtype=np.int32)
+        new_scores = np.full((len(new_ids), k), np.nan, dtype=np.float32)
+        for j in range(len(new_ids)):
+            column = similarities[:, j]
+            best = top_k(column, k)
+            best = best[np.isfinite(column[best])]
+            new_indices[j, :len(best)] = best
+            new_scores[j, :len(best)] = column[best]
+
+        if old_n:
+            existing = np.arange(old_n)
+            candidates = np.broadcast_to(new_ids, (old_n, len(new_ids)))
+            self.neighbours.offer(existing, candidates, similarities[:old_n])
+        self.neighbours.extend(names, new_indices, new_scores)
+        return new_ids
+
+    @property
+    def oov_rate(self):
+        """Share of new facility tokens missing from the TF-IDF vocabulary."""
+        return self._oov / self._tokens if self._tokens else 0.0
+
+    @property
+    def scaler_drift(self):
+        """Largest absolute z-score, ``mean * sqrt(added)``, of the
+        standardized price features of new rows."""
+        if not self.added:
+            return 0.0
+        return float(np.abs(self._price_sum / self.added).max() * np.sqrt(self.added))
+
+    @property
+    def needs_rebuild(self):
+        drifted = self.added >= MIN_DRIFT_ROWS and self.scaler_drift > MAX_SCALER_DRIFT_Z
+        return self.oov_rate > MAX_OOV_RATE or drifted
+
+    def save(self, features_path, index_path):
+        """Write the updated feature blocks and neighbour index."""
+        vectors = self.recommender.vectors
+        with open(features_path, "wb") as file:
+            np.savez(
+                file,
+                names=self.recommender.names.astype(str),
+                **{
+                    name: vectors[:, block]
+                    for name, block in zip(("facilities", "price", "location"), self.recommender.slices)
+                },
+            )
+        self.neighbours.save(index_path)
@@ -0,0 +1,97 @@
+"""Calibrated price intervals from a precomputed residual table.
+
+The training notebook computes out-of-fold residuals of ``log1p(price)`` and
+stores split-conformal residual quantiles per sector/property_type bucket in
+``models/price_intervals.json``.  At serving time an interval is two
+dictionary lookups around the point prediction, with no extra model calls.
+Sparse buckets fall back to the property type, then to the global quantiles.
+"""
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+
+def _key(sector, property_type):
+    return f"{sector}|{property_type}"
+
+
+def _conformal_bounds(residuals, coverage):
+    """Finite-sample corrected lower/upper quantiles of signed residuals."""
+    residuals = np.sort(np.asarray(residuals, dtype=float))
+    n = len(residuals)
+    tail = (1 - coverage) / 2
+    upper = min(n - 1, math.ceil((n + 1) * (1 - tail)) - 1)
+    lower = max(0, math.floor((n + 1) * tail) - 1)
+    return [float(residuals[lower]), float(residuals[upper])]
+
+
+def fit_intervals(residuals, sectors, property_types, coverage=0.8, min_bucket=30):
+    """Residual quantile table for :class:`PriceIntervals`.
+
+    ``residuals`` are out-of-fold ``y - y_pred`` in log1p space.
+    """
+    frame = pd.DataFrame({
+        "residual": np.asarray(residuals, dtype=float),
+        "sector": np.asarray(sectors),
+        "property_type": np.asarray(property_types),
+    })
+    table = {
+        "coverage": coverage,
+        "min_bucket": min_bucket,
+        "global": _conformal_bounds(frame["residual"], coverage),
+        "property_type": {},
+        "sector": {},
+    }
+    for property_type, group in frame.groupby("property_type"):
+        if len(group) >= min_bucket:
+            table["property_type"][str(property_type)] = _conformal_bounds(group["residual"], coverage)
+    for (sector, property_type), group in frame.groupby(["sector", "property_type"]):
+        if len(group) >= min_bucket:
+            table["sector"][_key(sector, property_type)] = _conformal_bounds(group["residual"], coverage)
+    return table
+
+
+class PriceIntervals:
+    """Lookup of log-space residual bounds per sector/property_type bucket."""
+
+    def __init__(self, table):
+        self.coverage = table["coverage"]
+        self.global_bounds = tuple(table["global"])
+        self.by_type = {k: tuple(v) for k, v in table["property_type"].items()}
+        self.by_sector = {k: tuple(v) for k, v in table["sector"].items()}
+        # Lower and upper bounds as separate lookups for :meth:`bands`
+        self._sides = [
+            ({k: v[side] for k, v in self.by_sector.items()}, {k: v[side] for k, v in self.by_type.items()})
+            for side in (0, 1)
+        ]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls(json.load(f))
+
+    def bounds(self, sector, property_type):
+        """Lower and upper log-space residual for one bucket."""
+        found = self.by_sector.get(_key(sector, property_type))
+        if found is None:
+            found = self.by_type.get(str(property_type), self.global_bounds)
+        return found
+
+    def band(self, price, sector, property_type):
+        """Interval in Cr around one predicted ``price``."""
+        lower, upper = self.bounds(sector, property_type)
+        log_price = math.log1p(price)
+        return math.expm1(log_price + lower), math.expm1(log_price + upper)
+
+    def bands(self, prices, sectors, property_types):
+        """Vectorized :meth:`band` for arrays of prices and buckets."""
+        types = pd.Series(np.asarray(property_types)).astype(str)
+        keys = pd.Series(np.asarray(sectors)).astype(str) + "|" + types
+        bounds = [
+            keys.map(by_sector).fillna(types.map(by_type)).fillna(fallback).to_numpy(dtype=float)
+            for (by_sector, by_type), fallback in zip(self._sides, self.global_bounds)
+        ]
+        log_prices = np.log1p(np.asarray(prices, dtype=float))
+        return np.expm1(log_prices + bounds[0]), np.expm1(log_prices + bounds[1])
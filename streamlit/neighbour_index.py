@@ -0,0 +1,127 @@
+"""Precomputed top-K neighbour index for recommendations.
+
+Instead of keeping the dense N x N similarity matrices in memory, the build
+step stores the ``K`` best neighbours of every property as ``int32`` IDs and
+``float32`` scores.  Serving "similar properties" is then an O(k) slice.
+
+Property IDs are the row positions of ``Location_data.csv`` (which the
+similarity matrices follow) at build time; the index stores the names
+alongside so lookups never depend on positional alignment with other files.
+The index records the blend weights it was built with and its source:
+``"cosine"`` when ranked from the notebook's dense cosine matrices,
+``"features"`` when ranked from the exported feature vectors.  Scores from
+the two sources are on different scales and must not be mixed.
+"""
+import numpy as np
+import pandas as pd
+
+from recommender import DEFAULT_WEIGHTS, top_k
+
+FORMAT_VERSION = 1
+SOURCES = ("cosine", "features")
+
+
+class NeighbourIndex:
+    """Top-K neighbour IDs and scores per property, keyed by ID and name."""
+
+    def __init__(self, names, indices, scores, weights, source="cosine"):
+        if source not in SOURCES:
+            raise ValueError(f"Unknown neighbour index source {source!r}")
+        self.names = np.asarray(names)
+        self.ids = np.arange(len(self.names), dtype=np.int32)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.scores = np.asarray(scores, dtype=np.float32)
+        self.weights = tuple(float(w) for w in weights)
+        self.source = source
+        self._ids_by_name = {name: i for i, name in enumerate(self.names.tolist())}
+
+    def __contains__(self, name):
+        return name in self._ids_by_name
+
+    @property
+    def k(self):
+        return self.indices.shape[1]
+
+    @classmethod
+    def build(cls, names, matrices, weights=DEFAULT_WEIGHTS, k=50):
+        """Rank every property against the weighted blend of ``matrices``.
+
+        Rows are blended one at a time, so no blended N x N matrix is built.
+        Properties with fewer than ``k`` others are padded with ID ``-1``.
+        """
+        n = len(names)
+        indices = np.full((n, k), -1, dtype=np.int32)
+        scores = np.full((n, k), np.nan, dtype=np.float32)
+        for i in range(n):
+            row = sum(weight * matrix[i] for matrix, weight in zip(matrices, weights))
+            neighbours = top_k(row, k, exclude=i)
+            indices[i, :len(neighbours)] = neighbours
+            scores[i, :len(neighbours)] = row[neighbours]
+        return cls(names, indices, scores, weights, "cosine")
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) != FORMAT_VERSION:
+                raise ValueError(f"Unsupported neighbour index version in {path}")
+            # Indexes saved before the source was recorded were built from the cosine matrices
+            source = str(data["source"]) if "source" in data.files else "cosine"
+            return cls(data["names"], data["indices"], data["scores"], data["weights"], source)
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            np.savez(
+                file,
+                format_version=np.int32(FORMAT_VERSION),
+                names=self.names.astype(str),
+                indices=self.indices,
+                scores=self.scores,
+                weights=np.asarray(self.weights),
+                source=np.asarray(self.source),
+            )
+
+    def extend(self, names, indices, scores):
+        """Append rows for new properties; their IDs follow the existing ones."""
+        start = len(self.names)
+        self.names = np.concatenate([self.names, np.asarray(names)])
+        self.ids = np.arange(len(self.names), dtype=np.int32)
+        self.indices = np.vstack([self.indices, np.asarray(indices, dtype=np.int32)])
+        self.scores = np.vstack([self.scores, np.asarray(scores, dtype=np.float32)])
+        for i, name in enumerate(np.asarray(names).tolist(), start):
+            self._ids_by_name[name] = i
+
+    def offer(self, rows, candidate_ids, candidate_scores):
+        """Merge ``(len(rows), m)`` candidate neighbours into the lists of ``rows``."""
+        ids = np.hstack([self.indices[rows], np.asarray(candidate_ids, dtype=np.int32)])
+        scores = np.hstack([self.scores[rows], np.asarray(candidate_scores, dtype=np.float32)])
+        scores = np.where(ids >= 0, np.nan_to_num(scores, nan=-np.inf), -np.inf)
+        k = self.k
+        if ids.shape[1] > k:
+            keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            ids = np.take_along_axis(ids, keep, axis=1)
+            scores = np.take_along_axis(scores, keep, axis=1)
+        order = np.argsort(-scores, axis=1, kind="stable")
+        ids = np.take_along_axis(ids, order, axis=1)
+        scores = np.take_along_axis(scores, order, axis=1)
+        missing = np.isneginf(scores)
+        self.indices[rows] = np.where(missing, -1, ids)
+        self.scores[rows] = np.where(missing, np.nan, scores)
+
+    def has_weights(self, weights):
+        return np.allclose(self.weights, weights)
+
+    def id_of(self, name):
+        return self._ids_by_name[name]
+
+    def neighbours(self, property_id, k=5):
+        """``k`` best neighbour IDs and scores of ``property_id``."""
+        if k > self.k:
+            raise ValueError(f"Index only holds {self.k} neighbours per property")
+        ids = self.indices[property_id, :k]
+        valid = ids >= 0
+        return ids[valid], self.scores[property_id, :k][valid]
+
+    def recommend(self, name, k=5):
+        """Same frame as :func:`recommender.recommend`, served from the index."""
+        ids, scores = self.neighbours(self.id_of(name), k)
+        return pd.DataFrame({"PropertyName": self.names[ids], "SimilarityScore": scores})
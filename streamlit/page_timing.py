@@ -0,0 +1,99 @@
+"""Fragments with script-time instrumentation.
+
+A page calls :func:`start_page` first and :func:`end_page` last to record how
+long a full script run takes, and decorates its sections with
+:func:`timed_fragment`.  An interaction with a widget inside a fragment then
+re-executes only that fragment; the difference to the last full run is the
+script time the interaction saved.  Timings live in ``st.session_state`` and
+are shown when "Show rerun timings" is ticked in the sidebar.
+
+A fragment tells a partial rerun from a full run by whether its page's
+:func:`start_page` marker is open: only full script runs call it, and
+:func:`end_page` closes it.  This relies on public API only, rather than on
+Streamlit's internal script-run context.
+"""
+import functools
+import time
+
+import streamlit as st
+
+_KEY = "_page_timings"
+
+
+def _timings(page):
+    return st.session_state.setdefault(_KEY, {}).setdefault(page, {"full": None, "runs": 0, "fragments": {}})
+
+
+def _started_key(page):
+    return f"_page_started_{page}"
+
+
+def _fragment_rerun(page):
+    """True when only fragments of ``page``, not the whole script, are running."""
+    return _started_key(page) not in st.session_state
+
+
+def start_page(page):
+    st.session_state[_started_key(page)] = time.perf_counter()
+    st.sidebar.checkbox("Show rerun timings", key="show_timings")
+
+
+def end_page(page):
+    started = st.session_state.pop(_started_key(page), None)
+    if started is None:
+        return
+    timings = _timings(page)
+    timings["full"] = time.perf_counter() - started
+    timings["runs"] += 1
+    if st.session_state.get("show_timings"):
+        timing_summary(page)
+
+
+def timing_summary(page):
+    """Sidebar table of the last full run and of each fragment's partial reruns."""
+    timings = _timings(page)
+    with st.sidebar.expander("⏱️ Rerun timings", expanded=True):
+        st.metric("Full page run", f"{timings['full'] * 1000:,.0f} ms", f"{timings['runs']} run(s)", delta_color="off")
+        rows = [
+            {
+                "Section": name,
+                "Last rerun (ms)": stats["seconds"] * 1000,
+                "Partial reruns": stats["partial_runs"],
+                "Saved (ms)": stats["saved"] * 1000,
+            }
+            for name, stats in timings["fragments"].items()
+        ]
+        if rows:
+            st.dataframe(rows, hide_index=True, column_config={
+                column: st.column_config.NumberColumn(format="%.0f")
+                for column in ("Last rerun (ms)", "Saved (ms)")
+            })
+
+
+def _record(page, name, seconds):
+    timings = _timings(page)
+    stats = timings["fragments"].setdefault(name, {"seconds": 0.0, "partial_runs": 0, "saved": 0.0})
+    stats["seconds"] = seconds
+    if _fragment_rerun(page):
+        stats["partial_runs"] += 1
+        if timings["full"] is not None:
+            stats["saved"] += max(timings["full"] - seconds, 0.0)
+        if st.session_state.get("show_timings"):
+            full = "" if timings["full"] is None else f" instead of {timings['full'] * 1000:,.0f} ms for the whole page"
+            st.caption(f"⏱️ {name} reran in {seconds * 1000:,.0f} ms{full}")
+
+
+def timed_fragment(page, name, **fragment_options):
+    """``st.fragment`` that records the run time of ``name`` on ``page``."""
+    def decorate(func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(page, name, time.perf_counter() - start)
+
+        return st.fragment(timed, **fragment_options)
+
+    return decorate
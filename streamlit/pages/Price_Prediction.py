@@ -1,15 +1,36 @@
+import hashlib
 import streamlit as st
 import pandas as pd
-import pickle
 import numpy as np
-import time
-from config import BASE_DIR
+import plotly.express as px
+from artifacts import (
+    load_fast_predictor,
+    load_price_frame,
+    load_price_intervals,
+    load_price_model,
+    load_sector_coordinates,
+    price_model_fingerprint,
+)
+from affordability import AffordabilityGrid
+from page_timing import end_page, start_page, timed_fragment
+from prediction_cache import get_prediction_cache
+from pricing import (
+    FEATURE_COLUMNS,
+    missing_columns,
+    predict_in_chunks,
+    prepare_features,
+    price_band,
+    price_bands,
+    sector_surface,
+)
 st.set_page_config(
     page_title="Predict Property Price",
     page_icon="🏠",
     layout="centered",
     initial_sidebar_state="collapsed",
 )
+PAGE = "Price Prediction"
+start_page(PAGE)
 st.title("🏡 Property Price Prediction")
 st.markdown("---")
 
@@ -36,32 +57,8 @@ with col2:
     st.image("https://cdn.shopify.com/s/files/1/0278/7289/files/final_without_overlay_1024x1024.png?v=1518448244", use_container_width=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
-with open(BASE_DIR/"models/df.pkl", "rb") as file:
-    df = pickle.load(file)
+df = load_price_frame()
 st.markdown("---")
-st.subheader("Enter House Details")
-
-# property type
-property_type = st.selectbox("Property Type", df["property_type"].unique())
-#sector
-sector=st.selectbox("Sector",sorted(df['sector'].unique()))
-#age of property
-age_possession= st.selectbox("Age", df["agePossession"].unique())
-# furnishing type
-furnishing=st.selectbox("Furnishing type", df["furnishing_type"].unique())
-#luxury_cat
-luxury=st.selectbox("Luxury type", df["luxury_category"].unique())
-#floor
-floor=st.selectbox("Floor type", df["floor_category"].unique())
-#bALCONY
-bal=st.selectbox("Balconies", df["balcony"].unique())
-#
-
-bedroom = st.number_input("Bedrooms", min_value=0,max_value=15, step=1)
-bathroom = st.number_input("Bathrooms", min_value=0, step=1)
-area=st.number_input("Built-up Area (sqft)", min_value=500)
-servant=st.number_input("Servant room", max_value=1,min_value=0)
-store=st.number_input("Store room", max_value=1,min_value=0)
 
 st.markdown("""
 <style>
@@ -81,10 +78,34 @@ div.stButton > button:hover {
 </style>
 """, unsafe_allow_html=True)
 
-button = st.button("🔮 Predict Price")
 
-if button:
-    input_df = pd.DataFrame([{
+def listing_inputs():
+    """Render the house details form and return the entered listing."""
+    st.subheader("Enter House Details")
+
+    # property type
+    property_type = st.selectbox("Property Type", df["property_type"].unique())
+    #sector
+    sector=st.selectbox("Sector",sorted(df['sector'].unique()))
+    #age of property
+    age_possession= st.selectbox("Age", df["agePossession"].unique())
+    # furnishing type
+    furnishing=st.selectbox("Furnishing type", df["furnishing_type"].unique())
+    #luxury_cat
+    luxury=st.selectbox("Luxury type", df["luxury_category"].unique())
+    #floor
+    floor=st.selectbox("Floor type", df["floor_category"].unique())
+    #bALCONY
+    bal=st.selectbox("Balconies", df["balcony"].unique())
+    #
+
+    bedroom = st.number_input("Bedrooms", min_value=0,max_value=15, step=1)
+    bathroom = st.number_input("Bathrooms", min_value=0, step=1)
+    area=st.number_input("Built-up Area (sqft)", min_value=500)
+    servant=st.number_input("Servant room", max_value=1,min_value=0)
+    store=st.number_input("Store room", max_value=1,min_value=0)
+
+    return {
         "property_type": property_type,
         "sector": sector,
         "bedRoom": bedroom,
@@ -97,19 +118,252 @@ if button:
         "furnishing_type": furnishing,
         "luxury_category": luxury,
         "floor_category": floor
-    }])
-
-    st.dataframe(input_df,width='content')
-    
-    with st.spinner("🔍 Calculating house price..."):
-        time.sleep(1) 
-        with open(BASE_DIR /"models"/"lightgbm_price_pipeline.pkl", "rb") as file:
-            model = pickle.load(file)
-
-        prediction = model.predict(input_df)[0]
-        prediction = np.expm1(prediction)
-        prediction_left=prediction - 0.1*prediction
-        prediction_right=prediction + 0.1*prediction
-
-    st.success("✅ Prediction completed!")
-    st.subheader(f"💰 Predicted Price is between  {prediction_left:,.2f} Cr and {prediction_right:,.2f} Cr")
\ No newline at end of file
+    }
+
+
+@timed_fragment(PAGE, "Single listing")
+def single_prediction():
+    listing = listing_inputs()
+    button = st.button("🔮 Predict Price")
+
+    if button:
+        input_df = pd.DataFrame([listing])
+
+        st.dataframe(input_df,width='content')
+
+        with st.spinner("🔍 Calculating house price..."):
+            predictor = load_fast_predictor()
+
+            prediction = get_prediction_cache().get_or_compute(
+                listing, price_model_fingerprint(), predictor.predict
+            )
+            intervals = load_price_intervals()
+            if intervals is None:
+                prediction_left, prediction_right = price_band(prediction)
+            else:
+                prediction_left, prediction_right = intervals.band(prediction, listing["sector"], listing["property_type"])
+
+        st.success("✅ Prediction completed!")
+        st.subheader(f"💰 Predicted Price is between  {prediction_left:,.2f} Cr and {prediction_right:,.2f} Cr")
+        if intervals is not None:
+            st.caption(f"{intervals.coverage:.0%} interval calibrated on out-of-fold errors for {listing['sector']} {listing['property_type']}s")
+
+
+@timed_fragment(PAGE, "Bulk CSV upload")
+def bulk_prediction():
+    st.subheader("Upload Listings")
+    st.caption("CSV with the columns: " + ", ".join(FEATURE_COLUMNS))
+
+    uploaded = st.file_uploader("Listings CSV", type="csv")
+    if uploaded is None:
+        return
+
+    # Results survive reruns (e.g. the download click) for the same upload
+    upload_hash = hashlib.sha256(uploaded.getvalue()).hexdigest()
+    listings = pd.read_csv(uploaded, dtype={"balcony": str})
+    missing = missing_columns(listings)
+    if missing:
+        st.error(f"❌ Missing columns: {', '.join(missing)}")
+        return
+
+    st.write(f"### 📄 {len(listings):,} listings uploaded")
+    chunk_size = st.select_slider("Rows per batch", [1000, 2000, 5000, 10000, 20000], value=5000)
+
+    if st.button("🔮 Price All Listings"):
+        model = load_price_model()
+        features = prepare_features(listings)
+        prices = np.full(len(listings), np.nan)
+
+        progress = st.progress(0.0, text="🔍 Pricing listings...")
+        preview = st.empty()
+        for start, stop, chunk_prices in predict_in_chunks(model, features, chunk_size):
+            prices[start:stop] = chunk_prices
+            progress.progress(stop / len(listings), text=f"🔍 Priced {stop:,} of {len(listings):,} listings")
+            preview.dataframe(listings.iloc[start:stop].assign(predicted_price=chunk_prices).tail(10), width='content')
+        preview.empty()
+
+        priced = listings.copy()
+        priced["predicted_price"] = prices
+        priced["price_low"], priced["price_high"] = price_bands(prices, features, load_price_intervals())
+        st.session_state["bulk_priced"] = (upload_hash, priced)
+
+    stored = st.session_state.get("bulk_priced")
+    if stored is None or stored[0] != upload_hash:
+        return
+    priced = stored[1]
+
+    skipped = int(priced["predicted_price"].isna().sum())
+    st.success(f"✅ Priced {len(priced) - skipped:,} listings!")
+    if skipped:
+        st.warning(f"⚠️ {skipped:,} rows skipped because of missing or non-numeric values.")
+    st.dataframe(priced.head(100), width='content')
+
+    st.download_button(
+        "⬇️ Download priced listings",
+        priced.to_csv(index=False).encode("utf-8"),
+        file_name="priced_listings.csv",
+        mime="text/csv",
+    )
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_sector_surface(listing_items, areas, bedrooms, model_hash):
+    """One batched prediction per configuration; ``model_hash`` keys the cache."""
+    sectors = sorted(df["sector"].unique())
+    return sector_surface(load_price_model(), dict(listing_items), sectors, areas, bedrooms)
+
+
+@timed_fragment(PAGE, "What-if grid")
+def what_if_prediction():
+    listing = listing_inputs()
+
+    st.subheader("What-if Grid")
+    area_range = st.slider("Built-up area range (sqft)", 500, 10000, (1000, 3000), step=100)
+    area_steps = st.slider("Area steps", 1, 20, 6)
+    bedrooms = st.multiselect("Bedrooms (BHK)", list(range(16)), default=[int(listing["bedRoom"])])
+    if not bedrooms:
+        st.warning("Select at least one bedroom count.")
+        return
+
+    areas = tuple(float(a) for a in np.unique(np.linspace(area_range[0], area_range[1], area_steps).round()))
+    with st.spinner("🔍 Pricing every sector..."):
+        surface = cached_sector_surface(
+            tuple(sorted(listing.items())), areas, tuple(sorted(bedrooms)), price_model_fingerprint()
+        )
+    st.write(f"### 🗺️ {surface['sector'].nunique()} sectors × {len(areas)} areas × {len(bedrooms)} BHK")
+
+    bhk = st.selectbox("Show BHK", sorted(bedrooms)) if len(bedrooms) > 1 else bedrooms[0]
+    view = st.radio("View", ["Heatmap", "Map", "Table"], horizontal=True)
+    surface = surface[surface["bedRoom"] == bhk]
+    pivot = surface.pivot(index="sector", columns="built_up_area", values="price")
+    pivot = pivot.loc[pivot.mean(axis=1).sort_values(ascending=False).index]
+
+    if view == "Heatmap":
+        fig = px.imshow(
+            pivot,
+            labels={"x": "Built-up Area (sqft)", "y": "Sector", "color": "Price (Cr)"},
+            color_continuous_scale="Viridis",
+            aspect="auto",
+            height=max(400, 14 * len(pivot)),
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    elif view == "Map":
+        area = st.select_slider("Built-up area (sqft)", options=list(pivot.columns)) if len(pivot.columns) > 1 else pivot.columns[0]
+        coordinates = load_sector_coordinates()
+        points = pivot[area].rename("price").reset_index()
+        points["lat"] = points["sector"].map(lambda x: coordinates.get(x, {}).get("lat"))
+        points["lng"] = points["sector"].map(lambda x: coordinates.get(x, {}).get("lng"))
+        points = points.dropna(subset=["lat", "lng"])
+        fig = px.scatter_mapbox(
+            points,
+            lat="lat",
+            lon="lng",
+            color="price",
+            size="price",
+            hover_name="sector",
+            hover_data={"price": ":.2f", "lat": False, "lng": False},
+            color_continuous_scale="Viridis",
+            mapbox_style="open-street-map",
+            zoom=10,
+            height=600,
+            labels={"price": "Price (Cr)"},
+        )
+        fig.update_layout(margin={"r": 0, "t": 0, "l": 0, "b": 0})
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.dataframe(pivot.round(2), use_container_width=True)
+        st.download_button(
+            "⬇️ Download price surface",
+            surface.to_csv(index=False).encode("utf-8"),
+            file_name="sector_price_surface.csv",
+            mime="text/csv",
+        )
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def cached_affordability_grid(listing_items, model_hash):
+    """Monotone price grid per fixed-feature configuration, shared by sessions."""
+    sectors = sorted(df["sector"].unique())
+    property_types = sorted(df["property_type"].unique())
+    bedrooms = sorted(int(b) for b in df["bedRoom"].unique() if 1 <= b <= 6)
+    return AffordabilityGrid.build(
+        load_fast_predictor().predict_frame, dict(listing_items), sectors, property_types, bedrooms
+    )
+
+
+@timed_fragment(PAGE, "Budget search")
+def budget_search():
+    st.subheader("Your Budget")
+    budget = st.number_input("Budget (Cr)", min_value=0.1, value=1.5, step=0.1)
+    property_types = st.multiselect("Property Type", sorted(df["property_type"].unique()), default=sorted(df["property_type"].unique()))
+    bedrooms = st.multiselect("Bedrooms (BHK)", list(range(1, 7)), default=[2, 3])
+
+    with st.expander("Other preferences"):
+        fixed = {
+            "balcony": st.selectbox("Balconies", df["balcony"].unique()),
+            "agePossession": st.selectbox("Age", df["agePossession"].unique()),
+            "servant room": st.number_input("Servant room", max_value=1, min_value=0),
+            "store room": st.number_input("Store room", max_value=1, min_value=0),
+            "furnishing_type": st.selectbox("Furnishing type", df["furnishing_type"].unique()),
+            "luxury_category": st.selectbox("Luxury type", df["luxury_category"].unique()),
+            "floor_category": st.selectbox("Floor type", df["floor_category"].unique()),
+        }
+
+    with st.spinner("🔍 Building price grid..."):
+        grid = cached_affordability_grid(tuple(sorted(fixed.items())), price_model_fingerprint())
+    matches = grid.query(budget, property_types, bedrooms)
+
+    if matches.empty:
+        st.warning(f"No sector fits a budget of ₹{budget:,.2f} Cr with these preferences.")
+        return
+
+    st.success(f"✅ {matches['sector'].nunique()} sectors fit under ₹{budget:,.2f} Cr")
+    best = matches.groupby("sector")["max_area"].max().sort_values(ascending=False).head(20)
+    fig = px.bar(
+        x=best.values,
+        y=best.index,
+        orientation="h",
+        labels={"x": "Max Built-up Area (sqft)", "y": "Sector"},
+        height=max(400, 22 * len(best)),
+    )
+    fig.update_layout(yaxis={"autorange": "reversed"})
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(
+        matches.rename(columns={"max_area": "Max Area (sqft)", "price": "Price (Cr)"}).round(2),
+        use_container_width=True,
+    )
+
+
+@timed_fragment(PAGE, "Cache panel")
+def cache_panel():
+    cache = get_prediction_cache()
+    with st.expander("🛠️ Prediction cache (debug)"):
+        stats = cache.stats()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Entries", f"{stats['size']:,} / {stats['maxsize']:,}")
+        col2.metric("Hit rate", f"{stats['hit_rate']:.1%}")
+        col3.metric("Hits / Misses", f"{stats['hits']:,} / {stats['misses']:,}")
+        col4.metric("Evictions", f"{stats['evictions']:,}")
+        st.caption(f"Model {stats['model_hash']} · {stats['invalidations']} invalidation(s)")
+        if st.button("Clear cache"):
+            cache.clear()
+
+
+mode = st.radio(
+    "Mode",
+    ["Single listing", "Bulk CSV upload", "What-if across sectors", "Budget search"],
+    horizontal=True,
+)
+
+if mode == "Single listing":
+    single_prediction()
+elif mode == "Bulk CSV upload":
+    bulk_prediction()
+elif mode == "What-if across sectors":
+    what_if_prediction()
+else:
+    budget_search()
+
+cache_panel()
+
+end_page(PAGE)
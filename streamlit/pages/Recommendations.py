@@ -1,7 +1,26 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
-import pickle
-from config import BASE_DIR
+from artifacts import (
+    load_ann_recommender,
+    load_blended_similarity,
+    load_location_index,
+    load_neighbour_index,
+    load_point_index,
+    load_property_catalog,
+    load_proximity_search,
+    load_sector_coordinates,
+    load_similarity_sources,
+    load_typeahead_index,
+    recommendation_version,
+    similarity_store_paths,
+)
+from page_timing import end_page, start_page, timed_fragment
+from prefetch import get_prefetcher
+from recommender import DEFAULT_WEIGHTS, recommend, recommend_weighted
+
+PAGE = "Recommendations"
+
 # ---------------- Page Config ----------------
 st.set_page_config(
     page_title="Recommendation of Properties",
@@ -9,6 +28,7 @@ st.set_page_config(
     layout="centered",
     initial_sidebar_state="collapsed",
 )
+start_page(PAGE)
 st.markdown(
     """
     <style>
@@ -66,67 +86,174 @@ st.markdown(
 st.title("🏡 Property Recommendations")
 st.markdown("---")
 
-# ---------------- Load Data ----------------
-location_df = pd.read_csv(BASE_DIR/"datasets"/"Location_data.csv")
-location_df.set_index("PropertyName", inplace=True)
-
-# ---------------- Inputs ----------------
-area = st.selectbox("Select your Area", sorted(location_df.columns))
-radius = st.number_input("Select Radius (in kms)", min_value=1, step=1)
-
-# ---------------- Search Button ----------------
-if st.button("Find Properties"):
-    results_df = location_df[location_df[area] < radius * 1000]
-
-    st.session_state["area"] = area
-    st.session_state["radius"] = radius
-    st.session_state["results_df"] = results_df
-    st.session_state["search_results"] = results_df.index.to_list()
-    st.session_state["selected_property"] = None
-
-# ---------------- Display Results ----------------
-if "results_df" in st.session_state:
-
-    results_df = st.session_state["results_df"]
-
-    st.success(
-        f"Finding properties in {st.session_state['area']} "
-        f"within {st.session_state['radius']} kms radius!"
-    )
+PAGE_SIZES = [10, 25, 50, 100]
+TYPEAHEAD_MATCHES = 10
 
-    st.write(f"### 🔍 Found {len(results_df)} properties")
+# ---------------- Load Data ----------------
+location_index = load_location_index()
+point_index = load_point_index()
+catalog = load_property_catalog()
+typeahead = load_typeahead_index()
 
-    for prop in results_df.index:
-        distance = results_df.loc[prop, st.session_state["area"]] / 1000
 
-        col1, col2 = st.columns([4, 1])
+@timed_fragment(PAGE, "Project search")
+def project_search():
+    query = st.text_input("🔎 Jump to a project", placeholder="Type a project name")
+    if not query:
+        return
+    matches = typeahead.search(query, k=TYPEAHEAD_MATCHES, kinds=("property",))
+    if not matches:
+        st.caption("No matching project.")
+        return
+    col1, col2 = st.columns([4, 1])
+    project = col1.selectbox("Project", [match.label for match in matches], label_visibility="collapsed")
+    if col2.button("View", key="jump_view"):
+        st.session_state["selected_property"] = project
+        st.rerun()
+
+
+@timed_fragment(PAGE, "Search results")
+def search_section():
+    # ---------------- Inputs ----------------
+    search_modes = ["One landmark", "Several landmarks"] + (["Around a point"] if point_index is not None else [])
+    search_mode = st.radio("Search by", search_modes, horizontal=True)
+
+    if search_mode == "One landmark":
+        query = st.text_input("Search your Area", placeholder="Type a landmark, e.g. metro, Huda City Centre")
+        matches = typeahead.search(query, k=TYPEAHEAD_MATCHES, kinds=("landmark",))
+        area = st.selectbox("Select your Area", [match.label for match in matches], placeholder="Type above to search")
+        radius = st.number_input("Select Radius (in kms)", min_value=1, step=1)
+    elif search_mode == "Around a point":
+        sector_coordinates = load_sector_coordinates()
+        sector = st.selectbox("Start from", sorted(sector_coordinates))
+        col1, col2 = st.columns(2)
+        lat = col1.number_input("Latitude", value=sector_coordinates[sector]["lat"], format="%.5f", key=f"lat_{sector}")
+        lng = col2.number_input("Longitude", value=sector_coordinates[sector]["lng"], format="%.5f", key=f"lng_{sector}")
+        radius = st.number_input("Select Radius (in kms)", min_value=1, step=1)
+    else:
+        proximity = load_proximity_search()
+        query = st.text_input("Search landmarks", placeholder="Type a landmark, e.g. school, Rapid Metro")
+        # Only the chosen targets and the top matches are sent to the browser
+        if query:
+            matches = [match.label for match in typeahead.search(query, k=TYPEAHEAD_MATCHES, kinds=("category", "landmark"))]
+        else:
+            matches = list(proximity.categories)
+        targets = st.multiselect(
+            "Near all of",
+            list(dict.fromkeys(st.session_state.get("proximity_targets", []) + matches)),
+            key="proximity_targets",
+            help="Categories such as 'Any metro station' use the nearest landmark of that kind.",
+        )
+        constraints = []
+        for target in targets:
+            col1, col2 = st.columns(2)
+            max_km = col1.number_input(f"Max kms to {target}", min_value=0.5, value=3.0, step=0.5, key=f"radius_{target}")
+            weight = col2.slider(f"Importance of {target}", 0.0, 1.0, 1.0, 0.1, key=f"weight_{target}")
+            constraints.append((target, max_km * 1000, weight))
+
+    # ---------------- Search Button ----------------
+    if st.button("Find Properties"):
+        results_df = None
+        if search_mode == "One landmark" and area is None:
+            st.warning("Search for a landmark first.")
+        elif search_mode == "One landmark":
+            # Nearest first
+            results_df = location_index.radius_frame(area, radius * 1000)
+            targets = [area]
+            label = f"in {area} within {radius} kms radius"
+        elif search_mode == "Around a point":
+            # Estimated project positions, nearest first
+            results_df = point_index.within(lat, lng, radius * 1000).rename(columns={"distance": "point"})
+            targets = ["point"]
+            label = f"within {radius} kms of ({lat:.4f}, {lng:.4f})"
+        elif constraints:
+            # Best weighted distance first
+            results_df = proximity.query(constraints)
+            label = " and ".join(f"within {meters / 1000:g} kms of {target}" for target, meters, _ in constraints)
+        else:
+            st.warning("Pick at least one landmark.")
+
+        if results_df is not None:
+            had_selection = st.session_state.get("selected_property") is not None
+            st.session_state["search_label"] = label
+            st.session_state["search_targets"] = targets
+            st.session_state["results_df"] = results_df
+            st.session_state["search_results"] = results_df.index.to_list()
+            st.session_state["selected_property"] = None
+            st.session_state["results_pick"] = None
+            st.session_state["results_orders"] = {}
+            st.session_state["results_page"] = 1
+            st.session_state["search_id"] = st.session_state.get("search_id", 0) + 1
+            if had_selection:
+                st.rerun()
 
-        with col1:
-            st.markdown(
-    f"""
-    <div class="property-card">
-        <div style="display:flex; align-items:center; gap:10px;">
-            <span style="font-size:22px;">🏢</span>
-            <h4>{prop}</h4>
-        </div>
-        <p>📍 Distance: <b>{distance:.2f} km</b></p>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
+    # ---------------- Display Results ----------------
+    if "results_df" in st.session_state:
+
+        results_df = st.session_state["results_df"]
+        targets = st.session_state["search_targets"]
+
+        st.success(f"Finding properties {st.session_state['search_label']}!")
+
+        st.write(f"### 🔍 Found {len(results_df)} properties")
+
+        if len(results_df):
+            sort_options = ["Best match", "Name"]
+            if len(targets) > 1:
+                sort_options[1:1] = [f"Distance to {target}" for target in targets]
+            col1, col2, col3 = st.columns([2, 1, 1])
+            sort_by = col1.selectbox("Sort by", sort_options, key="results_sort")
+            page_size = col2.selectbox("Per page", PAGE_SIZES, key="results_page_size")
+            pages = -(-len(results_df) // page_size)
+            if st.session_state.get("results_page", 1) > pages:
+                st.session_state["results_page"] = pages
+            page = col3.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key="results_page")
+
+            # Sort once per search and sort key; each rerun only slices one page
+            orders = st.session_state.setdefault("results_orders", {})
+            if sort_by not in orders:
+                if sort_by == "Best match":
+                    orders[sort_by] = np.arange(len(results_df))
+                elif sort_by == "Name":
+                    orders[sort_by] = np.argsort(results_df.index.to_numpy(dtype=str), kind="stable")
+                else:
+                    orders[sort_by] = np.argsort(results_df[sort_by.removeprefix("Distance to ")].to_numpy(), kind="stable")
+            rows = orders[sort_by][(page - 1) * page_size:page * page_size]
+            visible = results_df.iloc[rows]
+
+            table = pd.DataFrame({"Property": visible.index})
+            for target in targets:
+                table["Distance (km)" if len(targets) == 1 else f"{target} (km)"] = visible[target].to_numpy() / 1000
+            event = st.dataframe(
+                table,
+                hide_index=True,
+                use_container_width=True,
+                on_select="rerun",
+                selection_mode="single-row",
+                column_config={column: st.column_config.NumberColumn(format="%.2f") for column in table.columns[1:]},
+                key=f"results_table_{st.session_state['search_id']}_{sort_by}_{page_size}_{page}",
+            )
+            st.caption(
+                f"Showing {(page - 1) * page_size + 1}–{(page - 1) * page_size + len(table)} of {len(results_df)}. "
+                "Select a row to view the property."
+            )
 
+            picked = table["Property"].iloc[event.selection.rows[0]] if event.selection.rows else None
+            # Only a new pick changes the selection, so recommendation clicks stick
+            if picked is not None and picked != st.session_state.get("results_pick"):
+                st.session_state["results_pick"] = picked
+                st.session_state["selected_property"] = picked
+                # The selected-property panel lives outside this fragment
+                st.rerun()
 
 
-        with col2:
-            if st.button("View", key=f"view_{prop}"):
-                st.session_state["selected_property"] = prop
-                st.rerun()
+@timed_fragment(PAGE, "Selected property")
 def show_property_basic_info(prop_name):
-    if prop_name not in property_detail_df.index:
+    if prop_name not in catalog or not catalog.has_details[catalog.id_of(prop_name)]:
         st.warning("Property details not available.")
         return
 
-    prop = property_detail_df.loc[prop_name]
+    property_id = catalog.id_of(prop_name)
 
     st.markdown("### 🏠 Property Overview")
 
@@ -139,26 +266,19 @@ def show_property_basic_info(prop_name):
      st.markdown(f"## {prop_name}")
 
     # ---- Sub Location ----
-     st.markdown(f"📍 **Sub-Location:** {prop.get('PropertySubName', 'N/A')}")
+     st.markdown(f"📍 **Sub-Location:** {catalog.sub_names[property_id] or 'N/A'}")
 
     # ---- Property Link ----
-     link = prop.get("Link", "")
-     if pd.notna(link) and link != "":
+     link = catalog.links[property_id]
+     if link:
         st.markdown(f"🔗 **More Details:** [Visit Property Page]({link})")
 
 # ================= RIGHT COLUMN =================
     with right_col:
-     facility = prop.get("TopFacilitiesStr", "")
-     if pd.notna(facility) and facility != "":
-        facility = facility.replace("[", "").replace("]", "")
-        facilities_list = facility.split(", ")
+     facilities = catalog.facilities[property_id]
+     if facilities:
         st.markdown("### 🛠️ Top Facilities")
-        m=0
-        for fac in facilities_list:
-            m=m+1
-            if m>5:
-                break
-            fac = fac.strip().strip("'").strip('"')
+        for fac in facilities[:5]:
             st.markdown(
                 f"""
                 <span style="
@@ -176,37 +296,93 @@ def show_property_basic_info(prop_name):
                 """,
                 unsafe_allow_html=True
             )
-# load cosine matrices
-cosine_sim1 = pickle.load(open(BASE_DIR/"models/cosine_sim1.pkl",'rb'))
-cosine_sim2 = pickle.load(open(BASE_DIR/"models/cosine_sim2.pkl",'rb'))
-cosine_sim3 = pickle.load(open(BASE_DIR/"models/cosine_sim3.pkl",'rb'))
-
-
-def recommend_properties_with_scores(property_name, top_n=5):
-    cosine_sim_matrix = 0.3*cosine_sim3 + 0.3*cosine_sim2 + 0.1*cosine_sim1
-
-    idx = location_df.index.get_loc(property_name)
-
-    sim_scores = list(enumerate(cosine_sim_matrix[idx]))
-    sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
-
-    top_indices = [i[0] for i in sim_scores[1:top_n+1]]
-    top_scores = [i[1] for i in sim_scores[1:top_n+1]]
-
-    top_properties = location_df.index[top_indices].tolist()
-
-    return pd.DataFrame({
-        "PropertyName": top_properties,
-        "SimilarityScore": top_scores
-    })
+def can_recommend(property_name):
+    """Whether some recommendation source knows ``property_name``; properties
+    appended by ``build_artifacts.py add-properties`` are only in the
+    neighbour index and the feature vectors."""
+    if property_name in catalog:
+        return True
+    index = load_neighbour_index()
+    engine = load_ann_recommender()
+    return (index is not None and property_name in index) or (engine is not None and property_name in engine)
+
+
+def recommend_properties_with_scores(property_name, top_n=5, weights=DEFAULT_WEIGHTS):
+    custom = tuple(weights) != tuple(DEFAULT_WEIGHTS)
+
+    # Serve from the precomputed neighbour index when it has been built
+    index = load_neighbour_index()
+    if not custom and index is not None and index.has_weights(weights) and property_name in index and top_n <= index.k:
+        return index.recommend(property_name, top_n)
+
+    # Feature-vector index: no N x N similarity at all
+    engine = load_ann_recommender()
+    if engine is not None and property_name in engine:
+        return engine.recommend(property_name, top_n, weights)
+
+    # The dense matrices only cover the catalog
+    if property_name not in catalog:
+        return pd.DataFrame({"PropertyName": [], "SimilarityScore": []})
+    idx = catalog.id_of(property_name)
+
+    if custom or all(path.exists() for path in similarity_store_paths()):
+        # Blend only this property's row of each source
+        return recommend_weighted(catalog.names, load_similarity_sources(), weights, idx, top_n)
+
+    similarity = load_blended_similarity()
+    catalog.verify("models/cosine_sim*.pkl", length=len(similarity))
+    return recommend(catalog.names, similarity[idx], idx, top_n)
+
+
+def ranked_neighbours(key):
+    """Recommendations for a ``(property, weights, top_n)`` prefetch key."""
+    property_name, weights, top_n = key
+    return recommend_properties_with_scores(property_name, top_n, weights)
+
+
+def prefetch_panel():
+    with st.expander("🛠️ Prefetch cache (debug)"):
+        stats = get_prefetcher().stats()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Entries", f"{stats['size']:,} / {stats['maxsize']:,}")
+        col2.metric("Hit rate", f"{stats['hit_rate']:.1%}")
+        col3.metric("Prefetched", f"{stats['prefetched']:,}")
+        col4.metric("Skipped (CPU busy)", f"{stats['skipped']:,}")
+        st.caption(
+            f"{stats['hits']:,} hits · {stats['misses']:,} misses · {stats['pending']} in flight · "
+            f"{stats['evictions']:,} evictions · load {stats['load']:.2f} per CPU"
+        )
+
+
+def similarity_weights():
+    """Sliders for how much facilities, price and location count."""
+    with st.expander("⚖️ Tune what 'similar' means"):
+        col1, col2, col3 = st.columns(3)
+        facilities = col1.slider("Facilities", 0.0, 1.0, DEFAULT_WEIGHTS[0], 0.05, key="w_facilities")
+        price = col2.slider("Price & size", 0.0, 1.0, DEFAULT_WEIGHTS[1], 0.05, key="w_price")
+        location = col3.slider("Location", 0.0, 1.0, DEFAULT_WEIGHTS[2], 0.05, key="w_location")
+    if facilities + price + location == 0:
+        st.warning("All weights are zero; using the defaults.")
+        return DEFAULT_WEIGHTS
+    return (facilities, price, location)
+
+
+@timed_fragment(PAGE, "Recommendations")
 def show_recommendations(current_property):
     st.markdown("## 🔁 Recommended Properties")
 
-    rec_df = recommend_properties_with_scores(current_property, top_n=5)
+    weights = similarity_weights()
+    # Cached results are dropped whenever a recommendation artifact is rebuilt
+    version = recommendation_version()
+    prefetcher = get_prefetcher()
+    rec_df = prefetcher.get_or_compute((current_property, weights, 5), version, ranked_neighbours)
+
+    if rec_df.empty:
+        st.info("No recommendations for this property with these weights.")
 
-    for _, row in rec_df.iterrows():
-        prop = row["PropertyName"]
-        links = property_detail_df.loc[prop, "Link"]
+    for prop in rec_df["PropertyName"].tolist():
+        # Properties appended after the catalog was built have no details yet
+        links = catalog.links[catalog.id_of(prop)] if prop in catalog else ""
 
         col1, col2 = st.columns([2, 1])
 
@@ -230,7 +406,7 @@ def show_recommendations(current_property):
          )
 
         with col2:
-          if st.button("View", key=f"rec_view_{prop}"):
+          if st.button("View", key=f"rec_view_{prop}", disabled=not can_recommend(prop)):
            st.session_state["selected_property"] = prop
 
            st.markdown(
@@ -245,23 +421,31 @@ def show_recommendations(current_property):
 
            st.rerun()
 
+    # The next click is most likely one of these; rank their neighbours now
+    prefetcher.prefetch(
+        [(prop, weights, 5) for prop in rec_df["PropertyName"].tolist() if prop in catalog],
+        version,
+        ranked_neighbours,
+    )
+    prefetch_panel()
+
     
 
     
 
  
 
+project_search()
+search_section()
+
 # ---------------- Selected Property ----------------
 if st.session_state.get("selected_property"):
     st.markdown("---")
     st.markdown('<div id="property-details"></div>', unsafe_allow_html=True)
     st.subheader("🏠 Selected Property")
     st.success(f"You selected: **{st.session_state['selected_property']}**")
-    property_detail_df = pd.read_csv(BASE_DIR/"datasets"/"property_detail.csv")
-    property_detail_df.set_index("PropertyName", inplace=True)
     show_property_basic_info(st.session_state["selected_property"])
     st.markdown("---")
     show_recommendations(st.session_state["selected_property"])
 
-
-    
\ No newline at end of file
+end_page(PAGE)
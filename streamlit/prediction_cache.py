@@ -0,0 +1,89 @@
+"""Bounded in-process LRU cache of single-listing price predictions.
+
+Users re-submit the same listing all the time, so predictions are memoized
+on the normalized 12-field feature tuple.  The cache remembers the hash of
+the model artifact it was filled from and empties itself when that changes.
+"""
+import threading
+from collections import OrderedDict
+
+from pricing import FEATURE_COLUMNS, NUMERIC_COLUMNS
+
+
+def normalize(listing):
+    """Hashable key for a listing: numbers as floats, categories as stripped strings."""
+    return tuple(
+        float(listing[column]) if column in NUMERIC_COLUMNS else str(listing[column]).strip()
+        for column in FEATURE_COLUMNS
+    )
+
+
+class PredictionCache:
+    """Thread-safe LRU mapping of normalized listings to predicted prices."""
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.model_hash = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _check_model(self, model_hash):
+        if model_hash != self.model_hash:
+            if self.model_hash is not None:
+                self.invalidations += 1
+            self._entries.clear()
+            self.model_hash = model_hash
+
+    def get_or_compute(self, listing, model_hash, compute):
+        """Cached ``compute(listing)`` for the model identified by ``model_hash``."""
+        key = normalize(listing)
+        with self._lock:
+            self._check_model(model_hash)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute(listing)
+
+        with self._lock:
+            if model_hash == self.model_hash:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "model_hash": (self.model_hash or "")[:12],
+        }
+
+
+_cache = PredictionCache()
+
+
+def get_prediction_cache():
+    """The process-wide cache shared by every session."""
+    return _cache
@@ -0,0 +1,147 @@
+"""Background prefetch of recommendation results for likely next clicks.
+
+A user who opens a property usually clicks one of its recommended
+properties next.  As soon as the recommendations are shown, their own
+recommendations are computed on a small thread pool into a bounded
+per-process LRU, so the click is served from memory.  Like
+:class:`prediction_cache.PredictionCache`, the cache remembers the artifact
+version it was filled from and empties itself when that changes.
+
+Prefetching is skipped while the 1-minute load average per CPU is above
+``max_load``: it only speculates, so it must not slow down real requests.
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+def cpu_pressure():
+    """1-minute load average per CPU, or 0.0 where the OS doesn't report it."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return 0.0
+
+
+class Prefetcher:
+    """Thread-safe LRU of computed values with speculative background fills."""
+
+    def __init__(self, maxsize=256, workers=2, max_load=0.75):
+        self.maxsize = maxsize
+        self.max_load = max_load
+        self._entries = OrderedDict()
+        # In-flight fills keyed by (version, key), so a fill started before a
+        # version change never removes the entry of a newer fill of the same key
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.skipped = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _check_version(self, version):
+        if version != self.version:
+            if self.version is not None:
+                self.invalidations += 1
+            self._entries.clear()
+            self._pending.clear()
+            self.version = version
+
+    def _store(self, key, version, value):
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, version, compute):
+        """Cached or in-flight ``compute(key)``, computed now on a miss."""
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            pending = self._pending.get((version, key))
+            if pending is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if pending is not None:
+            try:
+                return pending.result()
+            except Exception:
+                pass
+
+        value = compute(key)
+        self._store(key, version, value)
+        return value
+
+    def prefetch(self, keys, version, compute):
+        """Compute the missing ``keys`` in the background; returns how many were queued."""
+        if cpu_pressure() > self.max_load:
+            with self._lock:
+                self.skipped += len(keys)
+            return 0
+
+        queued = 0
+        with self._lock:
+            self._check_version(version)
+            for key in keys:
+                if key in self._entries or (version, key) in self._pending:
+                    continue
+                self._pending[(version, key)] = self._executor.submit(self._fill, key, version, compute)
+                queued += 1
+        return queued
+
+    def _fill(self, key, version, compute):
+        try:
+            value = compute(key)
+            self._store(key, version, value)
+            with self._lock:
+                if version == self.version:
+                    self.prefetched += 1
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop((version, key), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "pending": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "prefetched": self.prefetched,
+            "skipped": self.skipped,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "load": cpu_pressure(),
+        }
+
+
+_prefetcher = Prefetcher()
+
+
+def get_prefetcher():
+    """The process-wide prefetcher shared by every session."""
+    return _prefetcher
@@ -0,0 +1,270 @@
+"""Headless HTTP price prediction service.
+
+Loads the LightGBM pipeline once and serves JSON predictions without the
+Streamlit UI.  Concurrent requests are merged into one batched ``predict``
+call: the first queued request opens a short window, and everything that
+arrives before it closes (up to ``max_batch`` rows) is scored together.
+Requests larger than ``max_batch`` rows are split into ``max_batch`` chunks.
+
+Run from the ``streamlit`` folder::
+
+    python price_service.py --port 8000 --window-ms 5 --max-batch 256
+
+``POST /predict`` accepts one listing object, a list of listings, or
+``{"listings": [...]}`` with the 12 feature columns of ``models/df.pkl`` and
+answers ``{"predictions": [{"price": ..., "low": ..., "high": ...}, ...]}``
+with prices in Cr.  ``GET /health`` reports queue depth and batch counters.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from artifacts import load_price_intervals, load_price_model
+from pricing import predict_prices, prepare_features, price_bands, valid_rows
+
+
+class QueueFull(Exception):
+    """Raised when the batcher already holds ``max_queue`` pending requests."""
+
+
+def _gather(futures):
+    """Future of the concatenated results of ``futures``, in order."""
+    if len(futures) == 1:
+        return futures[0]
+    gathered = Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        try:
+            gathered.set_result(np.concatenate([future.result() for future in futures]))
+        except Exception as exc:
+            gathered.set_exception(exc)
+
+    for future in futures:
+        future.add_done_callback(done)
+    return gathered
+
+
+class MicroBatcher:
+    """Merge concurrent predict requests into batched model calls.
+
+    Batches never exceed ``max_batch`` rows.  :meth:`stop` fails the requests
+    still queued, so no caller waits on a future that will never resolve.
+    """
+
+    def __init__(self, model, window=0.005, max_batch=256, max_queue=1024):
+        self.model = model
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._carry = None
+        self.batches = 0
+        self.rows = 0
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    def submit(self, features):
+        """Queue a prepared feature frame; the future resolves to its prices."""
+        starts = range(0, max(len(features), 1), self.max_batch)
+        chunks = [features.iloc[start:start + self.max_batch] for start in starts]
+        futures = [Future() for _ in chunks]
+        with self._lock:
+            if self._stopped.is_set():
+                raise RuntimeError("price batcher is stopped")
+            for i, (chunk, future) in enumerate(zip(chunks, futures)):
+                try:
+                    self._queue.put_nowait((chunk, future))
+                except queue.Full:
+                    # Chunks already queued are skipped by the worker
+                    for queued in futures[:i]:
+                        queued.cancel()
+                    raise QueueFull(f"more than {self._queue.maxsize} requests pending") from None
+        return _gather(futures)
+
+    def stop(self):
+        """Stop the worker and fail every request still queued."""
+        with self._lock:
+            self._stopped.set()
+        self._worker.join()
+        error = RuntimeError("price batcher stopped before scoring this request")
+        if self._carry is not None:
+            self._carry[1].set_exception(error)
+            self._carry = None
+        while True:
+            try:
+                _, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def _next(self, timeout):
+        """Next queued item whose future is still wanted, marked running."""
+        if self._carry is not None:
+            item, self._carry = self._carry, None
+            return item
+        while True:
+            item = self._queue.get(timeout=timeout)
+            if item[1].set_running_or_notify_cancel():
+                return item
+
+    def _collect(self):
+        first = self._next(0.1)
+        batch, size = [first], len(first[0])
+        deadline = time.perf_counter() + self.window
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._next(remaining)
+            except queue.Empty:
+                break
+            if size + len(item[0]) > self.max_batch:
+                # Opens the next batch instead; its future is already running
+                self._carry = item
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                batch = self._collect()
+            except queue.Empty:
+                continue
+            frames = [features for features, _ in batch]
+            try:
+                merged = pd.concat(frames, ignore_index=True)
+                prices = np.full(len(merged), np.nan)
+                mask = valid_rows(merged)
+                if mask.any():
+                    prices[mask] = predict_prices(self.model, merged[mask])
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.rows += len(merged)
+            offset = 0
+            for features, future in batch:
+                future.set_result(prices[offset:offset + len(features)])
+                offset += len(features)
+
+
+def _listings(payload):
+    if isinstance(payload, dict):
+        payload = payload.get("listings", [payload])
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("expected a listing object or a non-empty list of listings")
+    return pd.DataFrame(payload)
+
+
+def _predictions(prices, features):
+    low, high = price_bands(prices, features, load_price_intervals())
+    return [
+        {"price": None, "low": None, "high": None} if np.isnan(price)
+        else {"price": float(price), "low": float(lo), "high": float(hi)}
+        for price, lo, hi in zip(prices, low, high)
+    ]
+
+
+def make_handler(batcher, timeout=10.0):
+    class PredictHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path != "/health":
+                self._send(404, {"error": "not found"})
+                return
+            self._send(200, {
+                "status": "ok",
+                "queue_depth": batcher.depth,
+                "batches": batcher.batches,
+                "rows": batcher.rows,
+            })
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                features = prepare_features(_listings(json.loads(self.rfile.read(length))))
+            except (ValueError, TypeError) as exc:
+                self._send(400, {"error": str(exc)})
+                return
+            try:
+                prices = batcher.submit(features).result(timeout=timeout)
+            except QueueFull as exc:
+                self._send(503, {"error": str(exc)})
+                return
+            except Exception as exc:
+                self._send(500, {"error": str(exc)})
+                return
+            self._send(200, {"predictions": _predictions(prices, features)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return PredictHandler
+
+
+def make_server(host="127.0.0.1", port=8000, window=0.005, max_batch=256, max_queue=1024):
+    """Build the HTTP server and its batcher; call ``serve_forever`` to run it."""
+    batcher = MicroBatcher(load_price_model(), window, max_batch, max_queue)
+    server = ThreadingHTTPServer((host, port), make_handler(batcher))
+    server.daemon_threads = True
+    server.batcher = batcher
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--window-ms", type=float, default=5.0, help="batching window")
+    parser.add_argument("--max-batch", type=int, default=256, help="max rows per predict call")
+    parser.add_argument("--max-queue", type=int, default=1024, help="max pending requests")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.window_ms / 1000, args.max_batch, args.max_queue)
+    print(f"Serving price predictions on http://{args.host}:{server.server_port}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.stop()
+
+
+if __name__ == "__main__":
+    main()
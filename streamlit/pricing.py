@@ -0,0 +1,108 @@
+"""Batch scoring helpers for the LightGBM price pipeline.
+
+The pipeline predicts ``log1p(price in Cr)`` from the 12 columns of
+``models/df.pkl``.  Scoring many listings through one ``predict`` call per
+chunk is orders of magnitude faster than predicting row by row.
+"""
+import numpy as np
+import pandas as pd
+
+FEATURE_COLUMNS = [
+    "property_type", "sector", "bedRoom", "bathroom", "balcony",
+    "agePossession", "built_up_area", "servant room", "store room",
+    "furnishing_type", "luxury_category", "floor_category",
+]
+NUMERIC_COLUMNS = ["bedRoom", "bathroom", "built_up_area", "servant room", "store room"]
+CATEGORICAL_COLUMNS = [c for c in FEATURE_COLUMNS if c not in NUMERIC_COLUMNS]
+
+BAND_WIDTH = 0.1
+
+
+def missing_columns(frame):
+    """Feature columns the model needs that ``frame`` does not have."""
+    return [c for c in FEATURE_COLUMNS if c not in frame.columns]
+
+
+def prepare_features(frame):
+    """Return the model columns of ``frame`` coerced to the training dtypes.
+
+    Categoricals are compared as strings by the encoders, so values such as a
+    balcony count read as ``int`` are converted back to ``str``.  Unparseable
+    numbers become NaN; see :func:`valid_rows`.
+    """
+    missing = missing_columns(frame)
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    features = frame[FEATURE_COLUMNS].copy()
+    for column in NUMERIC_COLUMNS:
+        features[column] = pd.to_numeric(features[column], errors="coerce")
+    for column in CATEGORICAL_COLUMNS:
+        features[column] = features[column].astype(str).str.strip()
+    return features
+
+
+def valid_rows(features):
+    """Boolean mask of rows with every numeric feature present."""
+    return features[NUMERIC_COLUMNS].notna().all(axis=1).to_numpy()
+
+
+def price_band(prices):
+    """Low and high end of the band shown around a predicted price."""
+    prices = np.asarray(prices, dtype=float)
+    return prices * (1 - BAND_WIDTH), prices * (1 + BAND_WIDTH)
+
+
+def price_bands(prices, features, intervals=None):
+    """Low and high price for each row of ``features``.
+
+    Uses the calibrated per-bucket ``intervals`` when available and falls
+    back to the fixed :func:`price_band` otherwise.
+    """
+    if intervals is None:
+        return price_band(prices)
+    return intervals.bands(prices, features["sector"], features["property_type"])
+
+
+def predict_prices(model, features):
+    """Predicted prices in Cr for every row of ``features`` in one call."""
+    if len(features) == 0:
+        return np.empty(0)
+    return np.expm1(model.predict(features))
+
+
+def predict_in_chunks(model, features, chunk_size=5000):
+    """Yield ``(start, stop, prices)`` for consecutive chunks of ``features``.
+
+    Rows rejected by :func:`valid_rows` get a NaN price instead of failing
+    the whole chunk.
+    """
+    mask = valid_rows(features)
+    for start in range(0, len(features), chunk_size):
+        stop = min(start + chunk_size, len(features))
+        prices = np.full(stop - start, np.nan)
+        chunk_mask = mask[start:stop]
+        if chunk_mask.any():
+            prices[chunk_mask] = predict_prices(model, features.iloc[start:stop][chunk_mask])
+        yield start, stop, prices
+
+
+def sector_surface(model, listing, sectors, areas=None, bedrooms=None):
+    """Price ``listing`` in every sector, optionally over area and BHK grids.
+
+    Builds the full cross product of ``sectors`` x ``areas`` x ``bedrooms``
+    (defaulting to the listing's own area and bedrooms) as one batch and
+    scores it with a single ``predict`` call.  Returns a long frame with the
+    ``sector``, ``built_up_area``, ``bedRoom`` and ``price`` columns.
+    """
+    areas = [listing["built_up_area"]] if areas is None else list(areas)
+    bedrooms = [listing["bedRoom"]] if bedrooms is None else list(bedrooms)
+    grid = pd.MultiIndex.from_product(
+        [list(sectors), areas, bedrooms], names=["sector", "built_up_area", "bedRoom"]
+    ).to_frame(index=False)
+
+    batch = pd.DataFrame({column: [listing[column]] * len(grid) for column in FEATURE_COLUMNS})
+    for column in grid.columns:
+        batch[column] = grid[column].to_numpy()
+
+    grid["price"] = predict_prices(model, batch)
+    return grid
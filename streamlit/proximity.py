@@ -0,0 +1,127 @@
+"""Compound proximity queries over the landmark distance index.
+
+A query is a list of ``(target, radius_m)`` or ``(target, radius_m, weight)``
+constraints, all of which must hold.  A target is a landmark column of
+``Location_data.csv`` or a landmark category such as "Any metro station",
+whose distance is the distance to the nearest landmark in the category.
+
+Categories are built from the canonical landmark names in
+``location_deduplication_mapping.csv``: a canonical landmark joins a
+category when its name, or any spelling variant merged into it, contains one
+of the category keywords.
+
+Every target keeps its properties sorted by distance, so the number of
+matches of each constraint is a binary search.  The query starts from the
+most selective constraint's slice and checks the remaining constraints only
+on those candidates, then ranks by the weighted sum of ``distance / radius``.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_KEYWORDS = {
+    "Any metro station": ("metro",),
+    "Any railway station": ("railway", "rly"),
+    "Any hospital": ("hospital", "hospitals", "medicity", "healthcare", "health care", "clinic", "multispeciality"),
+    "Any school": ("school", "vidyalaya", "preschool", "play school"),
+    "Any college or university": ("college", "collage", "university", "institute"),
+    "Any mall": ("mall", "plaza"),
+    "Any hotel": ("hotel", "inn", "resort"),
+    "Any park": ("park",),
+    "Any airport": ("airport",),
+}
+# Names that contain a category keyword without belonging to the category
+CATEGORY_EXCLUDES = {
+    "Any park": (
+        "business park", "corporate park", "tech park", "technology park", "it park", "cyber",
+        "industrial park", "park inn", "park hospital", "park dr", "park road", "central park",
+    ),
+}
+
+
+def landmark_categories(mapping, landmarks=None):
+    """Category -> canonical landmarks, from the deduplication ``mapping`` frame.
+
+    Only landmarks in ``landmarks`` (if given) are kept; empty categories are
+    dropped.
+    """
+    patterns = {
+        category: re.compile(r"\b(" + "|".join(map(re.escape, keywords)) + r")\b", re.IGNORECASE)
+        for category, keywords in CATEGORY_KEYWORDS.items()
+    }
+    excludes = {
+        category: re.compile("|".join(map(re.escape, phrases)), re.IGNORECASE)
+        for category, phrases in CATEGORY_EXCLUDES.items()
+    }
+    known = None if landmarks is None else set(landmarks)
+    categories = {category: [] for category in CATEGORY_KEYWORDS}
+    for canonical, variants in zip(mapping["Canonical_Location"], mapping["All_Variants"].fillna("")):
+        if known is not None and canonical not in known:
+            continue
+        text = " | ".join([canonical, variants])
+        for category, pattern in patterns.items():
+            if pattern.search(text) and not (category in excludes and excludes[category].search(text)):
+                categories[category].append(canonical)
+    return {category: members for category, members in categories.items() if members}
+
+
+class ProximitySearch:
+    """Multi-constraint radius search over a :class:`LandmarkDistanceIndex`."""
+
+    def __init__(self, index, categories):
+        self.index = index
+        self.categories = {}
+        self._category_rows = {}
+        for category, members in categories.items():
+            ids = [index.landmark_id(name) for name in members]
+            distances = index.distances[ids].min(axis=0)
+            order = np.argsort(distances, kind="stable").astype(np.int32)
+            self.categories[category] = list(members)
+            self._category_rows[category] = (distances, order, distances[order])
+
+    @property
+    def targets(self):
+        """Categories first, then every landmark."""
+        return list(self.categories) + self.index.landmarks
+
+    def _row(self, target):
+        if target in self._category_rows:
+            return self._category_rows[target]
+        j = self.index.landmark_id(target)
+        return self.index.distances[j], self.index.order[j], self.index.sorted_distances[j]
+
+    def count(self, target, meters):
+        """Number of properties closer than ``meters`` to ``target``."""
+        return int(np.searchsorted(self._row(target)[2], meters, side="left"))
+
+    def query(self, constraints):
+        """Properties meeting every constraint, best weighted score first.
+
+        Returns a frame indexed by PropertyName with the distance in metres
+        to each target and a ``score`` column (lower is better).
+        """
+        constraints = [(c[0], float(c[1]), float(c[2]) if len(c) > 2 else 1.0) for c in constraints]
+        if not constraints:
+            raise ValueError("At least one constraint is required")
+        targets = [target for target, _, _ in constraints]
+        if len(set(targets)) != len(targets):
+            raise ValueError("Each target may appear in only one constraint")
+
+        rows = [self._row(target) for target in targets]
+        counts = [np.searchsorted(row[2], radius, side="left") for row, (_, radius, _) in zip(rows, constraints)]
+        first = int(np.argmin(counts))
+
+        candidates = rows[first][1][:counts[first]]
+        for i in np.argsort(counts, kind="stable")[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = candidates[rows[i][0][candidates] < constraints[i][1]]
+
+        distances = {target: row[0][candidates] for target, row in zip(targets, rows)}
+        score = np.zeros(len(candidates))
+        for target, radius, weight in constraints:
+            score += weight * distances[target] / radius
+        result = pd.DataFrame(distances, index=pd.Index(self.index.names[candidates], name="PropertyName"))
+        result["score"] = score
+        return result.sort_values("score", kind="stable")
@@ -0,0 +1,69 @@
+"""Similar-property ranking over the blended cosine similarity matrices.
+
+The three similarity sources are facilities (``cosine_sim1``), price details
+(``cosine_sim2``) and location (``cosine_sim3``).  They are blended once when
+the artifacts load; a recommendation is then a partial selection of the
+top ``k`` entries of one row.
+
+For user-chosen weights only the requested row of each source is blended,
+which costs O(N) and never builds an N x N temporary.  A source is either a
+2-D array or any object with a ``row(i)`` method returning one row.
+"""
+import numpy as np
+import pandas as pd
+
+# Weights of the facilities, price-detail and location similarities
+DEFAULT_WEIGHTS = (0.1, 0.3, 0.3)
+
+
+def blend(matrices, weights=DEFAULT_WEIGHTS):
+    """Weighted sum of equally shaped similarity matrices."""
+    blended = np.multiply(matrices[0], weights[0], dtype=float)
+    for matrix, weight in zip(matrices[1:], weights[1:]):
+        blended += weight * matrix
+    return blended
+
+
+def source_row(source, i):
+    """Row ``i`` of a similarity source."""
+    return source.row(i) if hasattr(source, "row") else source[i]
+
+
+def blend_row(sources, weights, i):
+    """Weighted sum of row ``i`` of every source, as one length-N array."""
+    blended = np.multiply(source_row(sources[0], i), weights[0], dtype=float)
+    for source, weight in zip(sources[1:], weights[1:]):
+        if weight:
+            blended += weight * source_row(source, i)
+    return blended
+
+
+def top_k(scores, k, exclude=None):
+    """Indices of the ``k`` highest ``scores``, best first, skipping ``exclude``."""
+    scores = np.asarray(scores)
+    n = len(scores)
+    want = min(k + (exclude is not None), n)
+    if want <= 0:
+        return np.empty(0, dtype=np.int64)
+    if want < n:
+        candidates = np.argpartition(-scores, want - 1)[:want]
+    else:
+        candidates = np.arange(n)
+    if exclude is not None:
+        candidates = candidates[candidates != exclude]
+    order = np.argsort(-scores[candidates], kind="stable")
+    return candidates[order][:k]
+
+
+def recommend(names, scores, idx, k=5):
+    """``k`` neighbours of property ``idx`` as a PropertyName/SimilarityScore frame."""
+    neighbours = top_k(scores, k, exclude=idx)
+    return pd.DataFrame({
+        "PropertyName": np.asarray(names)[neighbours],
+        "SimilarityScore": np.asarray(scores)[neighbours],
+    })
+
+
+def recommend_weighted(names, sources, weights, idx, k=5):
+    """:func:`recommend` for custom ``weights``, blending only row ``idx``."""
+    return recommend(names, blend_row(sources, weights, idx), idx, k)
@@ -0,0 +1,80 @@
+"""Memory-mapped, optionally quantized on-disk similarity matrices.
+
+The ``cosine_sim*.pkl`` pickles are dense float64 matrices unpickled into
+private memory by every server process.  The exported store is a plain
+``.npy`` file opened with ``mmap_mode="r"``, so processes share one
+page-cached copy, next to a small JSON header with the quantization
+parameters.  Rows are dequantized on demand.
+
+Supported dtypes are ``float32``, ``float16`` and ``uint8`` (affine
+quantization of the matrix's value range onto 0..255).
+"""
+import json
+
+import numpy as np
+
+DTYPES = ("float32", "float16", "uint8")
+
+
+def _header_path(path):
+    return path.with_suffix(".json")
+
+
+def export(matrix, path, dtype="float16"):
+    """Write ``matrix`` to ``path`` (``.npy``) in ``dtype`` plus its header."""
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(DTYPES)}")
+    matrix = np.asarray(matrix, dtype=np.float64)
+    offset, scale = 0.0, 1.0
+    if dtype == "uint8":
+        low, high = float(matrix.min()), float(matrix.max())
+        offset, scale = low, (high - low) / 255 or 1.0
+        stored = np.rint((matrix - offset) / scale).astype(np.uint8)
+    else:
+        stored = matrix.astype(dtype)
+    np.save(path, stored)
+    with open(_header_path(path), "w") as f:
+        json.dump({"dtype": dtype, "offset": offset, "scale": scale, "shape": list(matrix.shape)}, f)
+
+
+class MappedSimilarity:
+    """Read-only similarity matrix backed by a memory-mapped ``.npy`` file."""
+
+    def __init__(self, path):
+        with open(_header_path(path), "r") as f:
+            header = json.load(f)
+        self.dtype = header["dtype"]
+        self.offset = header["offset"]
+        self.scale = header["scale"]
+        self.data = np.load(path, mmap_mode="r")
+        if list(self.data.shape) != header["shape"]:
+            raise ValueError(f"{path} does not match its header")
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def row(self, i):
+        """Row ``i`` dequantized to float64."""
+        values = np.asarray(self.data[i], dtype=np.float64)
+        if self.dtype == "uint8":
+            values = values * self.scale + self.offset
+        return values
+
+    def __getitem__(self, i):
+        return self.row(i)
+
+
+def topk_overlap(original, store, k=5, rows=None):
+    """Mean fraction of each row's top ``k`` (self excluded) kept by ``store``."""
+    from recommender import top_k
+
+    rows = range(len(original)) if rows is None else rows
+    overlaps = [
+        len(np.intersect1d(top_k(original[i], k, exclude=i), top_k(store.row(i), k, exclude=i))) / k
+        for i in rows
+    ]
+    return float(np.mean(overlaps))
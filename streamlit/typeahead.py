@@ -0,0 +1,122 @@
+"""Trigram and prefix index for search-as-you-type over names.
+
+Every entry (a landmark, a landmark category or a property) is indexed under
+its label and any aliases, e.g. the spelling variants merged into a
+canonical landmark by ``location_deduplication_mapping.csv``.  A query is
+scored against every indexed string by trigram overlap (Jaccard), so typos
+and missing spaces still match, with a bonus when it is a prefix of a word
+or of the whole string.  Only the top matches go to the browser.
+"""
+import bisect
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+WORD_PREFIX_BONUS = 1.0
+START_PREFIX_BONUS = 0.5
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text):
+    """Lower-case alphanumeric words separated by single spaces."""
+    return _NON_ALNUM.sub(" ", str(text).lower()).strip()
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Match(NamedTuple):
+    label: str
+    kind: str
+    score: float
+
+
+class TypeaheadIndex:
+    """Ranked fuzzy lookup of ``(label, kind, aliases)`` entries."""
+
+    def __init__(self, entries):
+        self.labels, self.kinds = [], []
+        keys, key_entries = [], []
+        for label, kind, aliases in entries:
+            entry = len(self.labels)
+            self.labels.append(label)
+            self.kinds.append(kind)
+            for text in dict.fromkeys(normalize(name) for name in [label, *aliases]):
+                if text:
+                    keys.append(text)
+                    key_entries.append(entry)
+        self.kind_codes = {kind: code for code, kind in enumerate(dict.fromkeys(self.kinds))}
+        self._entry_kinds = np.array([self.kind_codes[kind] for kind in self.kinds], dtype=np.int8)
+        self._key_entries = np.asarray(key_entries, dtype=np.int32)
+
+        postings = {}
+        sizes = []
+        for key_id, key in enumerate(keys):
+            grams = trigrams(key)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(key_id)
+        self._postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._key_sizes = np.asarray(sizes, dtype=np.float32)
+
+        # Every word start of every key, sorted, for prefix matches
+        words = []
+        for key_id, key in enumerate(keys):
+            starts = [0] + [m.end() for m in re.finditer(" ", key)]
+            words.extend((key[start:], key_id, start == 0) for start in starts)
+        words.sort()
+        self._words = [word for word, _, _ in words]
+        self._word_keys = np.array([key_id for _, key_id, _ in words], dtype=np.int32)
+        self._word_at_start = np.array([at_start for _, _, at_start in words], dtype=bool)
+
+    @classmethod
+    def from_sources(cls, landmarks, mapping=None, property_names=(), categories=()):
+        """Index of ``categories``, ``landmarks`` (with their mapped variants)
+        and ``property_names``."""
+        variants = {}
+        if mapping is not None:
+            for canonical, names in zip(mapping["Canonical_Location"], mapping["All_Variants"].fillna("")):
+                variants[canonical] = [name for name in names.split(" | ") if name]
+        entries = [(category, "category", ()) for category in categories]
+        entries += [(landmark, "landmark", variants.get(landmark, ())) for landmark in landmarks]
+        entries += [(name, "property", ()) for name in property_names]
+        return cls(entries)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def search(self, query, k=10, kinds=None):
+        """Top ``k`` matches for ``query``, best first."""
+        query = normalize(query)
+        if not query:
+            return []
+
+        scores = np.zeros(len(self._key_sizes), dtype=np.float32)
+        grams = trigrams(query)
+        postings = [self._postings[gram] for gram in grams if gram in self._postings]
+        if postings:
+            shared = np.bincount(np.concatenate(postings), minlength=len(scores)).astype(np.float32)
+            scores = shared / (len(grams) + self._key_sizes - shared)
+
+        lo = bisect.bisect_left(self._words, query)
+        hi = bisect.bisect_left(self._words, query + "\uffff")
+        if hi > lo:
+            scores[self._word_keys[lo:hi]] += WORD_PREFIX_BONUS
+            at_start = self._word_keys[lo:hi][self._word_at_start[lo:hi]]
+            scores[at_start] += START_PREFIX_BONUS
+
+        entry_scores = np.zeros(len(self.labels), dtype=np.float32)
+        np.maximum.at(entry_scores, self._key_entries, scores)
+        if kinds is not None:
+            allowed = [self.kind_codes[kind] for kind in kinds if kind in self.kind_codes]
+            entry_scores[~np.isin(self._entry_kinds, allowed)] = 0
+
+        candidates = np.flatnonzero(entry_scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-entry_scores[candidates], k - 1)[:k]]
+        ranked = sorted(candidates.tolist(), key=lambda i: (-entry_scores[i], len(self.labels[i]), self.labels[i]))
+        return [Match(self.labels[i], self.kinds[i], float(entry_scores[i])) for i in ranked]